@@ -0,0 +1,283 @@
+"""Headless timings of the data layer on synthetic datasets, saved as JSON.
+
+    python benchmark.py                                   # 100 .. 1M projects
+    python benchmark.py --sizes 100,10000 --repeat 5 --output before.json
+    python benchmark.py --sizes 10000 --compare before.json
+
+Each dataset is generated into a scratch directory from a fixed seed and
+a fixed "today", so two runs on one machine differ only by the code.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+from utils.deadlines import DeadlineScheduler
+from utils.history_store import HistoryStore
+from utils.journal import Journal
+from utils.loader import DATA_FILE, data_stamp, load_app_data, snapshot_data, write_snapshot
+from utils.project_index import make_project
+from utils.queries import due_soon, filter_projects
+from utils.recurrence import CompletionLedger, occurrences
+from utils.schema import DEFAULT_SETTINGS, SCHEMA_VERSION
+from utils.search_index import SearchIndex
+from utils.snapshot_cache import CACHE_FILE, write_cache
+from utils.stats_engine import StatsEngine
+
+DEFAULT_SIZES = "100,1000,10000,100000,1000000"
+TODAY = date(2026, 1, 15)  # Due dates, streaks and deadlines are relative to this
+RESULTS_VERSION = 1
+
+VERBS = ["Plan", "Write", "Fix", "Review", "Paint", "Clean", "Call", "Order", "Draft", "Sketch", "Update", "Book"]
+NOUNS = ["garden", "quarterly report", "taxes", "kitchen", "website", "budget", "novel chapter", "guitar practice",
+         "car service", "presentation", "invoices", "birthday party", "photo album", "newsletter"]
+CATEGORIES = (["General", "Work", "Personal", "Hobby"], [3, 4, 2, 1])
+STATUSES = (["Not Started", "In Progress", "Completed"], [45, 25, 30])
+RECURRENCES = (["None", "Daily", "Weekly", "Monthly"], [80, 6, 9, 5])
+SEARCHES = ["garden", "report", "tax", "pla", "guitar practice", "zzz"]
+
+HISTORY_SHARE = 0.05  # Projects with an edit history...
+HISTORY_FILES = 2000  # ...capped, as each history is a file of its own
+LEDGER_SERIES = 2000  # Recurring projects given 90 days of completions
+JOURNAL_TAIL = 100  # Edits left in the journal after the last snapshot
+
+
+def git_commit():
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=here,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=here,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def pick(rng, choices):
+    values, weights = choices
+    return rng.choices(values, weights)[0]
+
+
+def generate(size, seed):
+    """Write a dataset of ``size`` projects into the working directory.
+
+    Alongside app_data.json: edit histories, a completion ledger for
+    recurring projects and a journal tail, as a running app leaves them.
+    """
+    rng = random.Random(seed * 1000003 + size)
+    projects = []
+    for _ in range(size):
+        project = make_project(
+            f"{rng.choice(VERBS)} {rng.choice(NOUNS)} #{rng.randrange(1000)}",
+            pick(rng, CATEGORIES),
+            (TODAY + timedelta(days=rng.randint(-120, 180))).isoformat() if rng.random() < 0.85 else "",
+            pick(rng, RECURRENCES),
+        )
+        project["id"] = f"{rng.getrandbits(128):032x}"
+        project["status"] = pick(rng, STATUSES)
+        if project["status"] == "Completed":
+            project["completed_on"] = (TODAY - timedelta(days=rng.randint(0, 120))).isoformat()
+        if project["recurrence"] != "None":
+            project["anchor_date"] = (TODAY - timedelta(days=rng.randint(30, 400))).isoformat()
+        projects.append(project)
+    data = {"projects": projects, "settings": dict(DEFAULT_SETTINGS), "schema_version": SCHEMA_VERSION}
+
+    journal = Journal()
+    write_snapshot(snapshot_data(data, 0), journal, data_stamp(), fsync=False)
+    for project in rng.sample(projects, min(JOURNAL_TAIL, size)):
+        journal.append({"op": "update", "id": project["id"], "fields": {"status": "In Progress"}})
+
+    history_store = HistoryStore()
+    history_sample = rng.sample(projects, min(int(size * HISTORY_SHARE) or 1, HISTORY_FILES, size))
+    for project in history_sample:
+        moment = datetime.combine(TODAY, datetime.min.time())
+        for _ in range(rng.randint(1, 30)):
+            moment -= timedelta(hours=rng.randint(1, 200))
+            old, new = rng.sample(STATUSES[0], 2)
+            history_store.record(project, {"status": old}, {"status": new}, moment.isoformat())
+
+    ledger = CompletionLedger()
+    recurring = [p for p in projects if p["recurrence"] != "None"]
+    for project in rng.sample(recurring, min(LEDGER_SERIES, len(recurring))):
+        anchor = date.fromisoformat(project["anchor_date"])
+        for day in occurrences(anchor, project["recurrence"], TODAY - timedelta(days=90), TODAY):
+            if rng.random() < 0.8:
+                ledger.record(project["id"], project["name"], project["recurrence"], day)
+    return [p["id"] for p in history_sample]
+
+
+def timed_runs(repeat, run):
+    """Seconds taken by each of ``repeat`` calls, after one call to warm up."""
+    result = run()
+    runs = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = run()
+        runs.append(time.perf_counter() - start)
+    return runs, result
+
+
+def bench_size(size, args, report):
+    timings = {}
+
+    def measure(name, run, repeat=args.repeat):
+        runs, result = timed_runs(repeat, run)
+        timings[name] = {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+        report(f"  {name:<22} {statistics.median(runs) * 1000:10.2f} ms")
+        return result
+
+    history_keys = generate(size, args.seed)
+    file_size = os.path.getsize(DATA_FILE)
+
+    def load():
+        journal = Journal()
+        data, _ = load_app_data(journal, HistoryStore())
+        return data, journal
+    data, journal = measure("load_data", load)
+    # As on_stop leaves it after a clean shutdown
+    write_cache(data, journal.consumed, DATA_FILE)
+    measure("load_data_cached", load)
+    os.remove(CACHE_FILE)
+    projects = data["projects"]
+
+    for sort_by in ("Name", "Date", "Status"):
+        measure(f"filter_sort_{sort_by.lower()}", lambda: filter_projects(projects, "Active", "All", "", sort_by))
+
+    measure("search_index_build", lambda: SearchIndex().rebuild(projects))
+    search_index = SearchIndex()
+    search_index.rebuild(projects)
+    measure("search", lambda: [filter_projects(projects, "All", "All", q, "Name", search_index) for q in SEARCHES])
+    measure("search_relevance", lambda: [filter_projects(projects, "All", "All", q, "Relevance", search_index)
+                                         for q in SEARCHES])
+    measure("search_scan", lambda: [filter_projects(projects, "All", "All", q, "Name") for q in SEARCHES])
+
+    def stats():
+        engine = StatsEngine()
+        engine.rebuild(projects)
+        return engine.summary(TODAY), engine.chart_data(today=TODAY)
+    measure("stats", stats)
+
+    def deadline_scan():
+        # Opened after a week away: every threshold passed since then fires
+        scheduler = DeadlineScheduler(lambda project, days_left: None, lambda delay: None,
+                                      state_path=os.devnull)
+        scheduler.last_check = datetime.combine(TODAY - timedelta(days=7), datetime.min.time())
+        scheduler.rebuild(projects)
+        return scheduler.run(enabled=False, now=datetime.combine(TODAY, datetime.min.time()))
+    measure("deadline_scan", deadline_scan)
+    measure("due_soon", lambda: due_soon(projects, 7, TODAY))
+    measure("streaks", lambda: CompletionLedger().streaks(TODAY))
+    measure("history", lambda: [HistoryStore().load(key) for key in history_keys[:100]])
+
+    stamp = [data_stamp()]
+
+    def save():
+        stamp[0] = write_snapshot(snapshot_data(data, journal.consumed), journal, stamp[0], fsync=args.fsync)
+    measure("save_data", save)
+
+    entry = {"projects": size, "data_file_bytes": file_size, "timings": timings}
+    if resource:
+        # Peak for the whole process so far; sizes run smallest first
+        entry["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return entry
+
+
+def compare(old, new, report, threshold):
+    report(f"{'size':>8}  {'operation':<22} {'before':>10} {'after':>10} {'ratio':>7}")
+    for size, entry in new["results"].items():
+        before = old.get("results", {}).get(size)
+        if before is None:
+            continue
+        for name, timing in entry["timings"].items():
+            old_timing = before["timings"].get(name)
+            if not old_timing:
+                continue
+            ratio = timing["median"] / old_timing["median"] if old_timing["median"] else float("inf")
+            flag = "  slower" if ratio > 1 + threshold else "  faster" if ratio < 1 - threshold else ""
+            report(f"{size:>8}  {name:<22} {old_timing['median'] * 1000:8.2f}ms "
+                   f"{timing['median'] * 1000:8.2f}ms {ratio:6.2f}x{flag}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Time TaskTeal's data layer without the GUI")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"project counts to test (default: {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per operation; the median is reported")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--fsync", action="store_true", help="fsync snapshots like the app's default policy")
+    parser.add_argument("--output", help="results file (default: benchmark-<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="ratio change flagged by --compare")
+    parser.add_argument("--keep", action="store_true", help="keep the generated datasets")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    commit, dirty = git_commit()
+    output = os.path.abspath(args.output or f"benchmark-{commit}{'-dirty' if dirty else ''}.json")
+    old = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            old = json.load(f)
+
+    def report(line):
+        print(line, flush=True)
+
+    results = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "commit": commit,
+            "dirty": dirty,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "fsync": args.fsync,
+            "today": TODAY.isoformat(),
+        },
+        "results": {},
+    }
+    cwd = os.getcwd()
+    for size in sorted(sizes):
+        # The app keeps every file relative to its working directory
+        scratch = tempfile.mkdtemp(prefix=f"taskteal-bench-{size}-")
+        os.chdir(scratch)
+        report(f"{size} projects ({scratch})")
+        try:
+            results["results"][str(size)] = bench_size(size, args, report)
+        finally:
+            os.chdir(cwd)
+            if not args.keep:
+                shutil.rmtree(scratch, ignore_errors=True)
+        # Written after every size so a long run still leaves results behind
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+    report(f"Results written to {output}")
+    if old:
+        compare(old, results, report, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Headless TaskTeal reports: list, due, stats and bulk add, without Kivy.
+
+    python cli.py list --status Active --search garden --json
+    python cli.py due --days 3
+    python cli.py stats
+    printf 'Water plants\\nFile taxes\\n' | python cli.py add --category Personal
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+from datetime import date
+
+from utils.data_manager import archived_count, archived_day_counts, archived_weeks, load_week
+from utils.deadlines import notification_message
+from utils.filelock import DATA_LOCK
+from utils.history_store import HistoryStore
+from utils.journal import Journal
+from utils.loader import data_stamp, load_app_data, open_project_store, snapshot_data, write_snapshot
+from utils.project_index import make_project
+from utils.project_record import as_record
+from utils.queries import due_soon, filter_projects
+from utils.recurrence import CompletionLedger
+from utils.stats_engine import StatsEngine
+
+PROJECT_FIELDS = ("id", "name", "category", "status", "due_date", "recurrence")
+
+
+def project_line(project):
+    return (f"{project.get('name')} - Due: {project.get('due_date') or 'No Due Date'} "
+            f"[{project.get('status')}] [{project.get('recurrence')}] ({project.get('category')})")
+
+
+def emit(args, payload, lines):
+    if args.json:
+        json.dump(payload, args.out, ensure_ascii=False)
+        args.out.write("\n")
+    else:
+        for line in lines:
+            print(line, file=args.out)
+
+
+def load(journal, store):
+    """Load the data, saving it first if it had to be migrated, as the app does at startup.
+
+    Otherwise every run would migrate again: new IDs each time and
+    another copy of any inline history moved out.
+    """
+    with DATA_LOCK:
+        stamp = data_stamp()
+        # A store filled from app_data.json just now already holds the migrated data
+        from_store = store is not None and store.is_migrated()
+        data, migrated = load_app_data(journal, HistoryStore(), store)
+        if migrated:
+            print("Saving migrated data")
+            if store:
+                if from_store:
+                    store.replace_all(data)
+            elif write_snapshot(snapshot_data(data, journal.consumed), journal, stamp) is None:
+                print("app_data.json changed while migrating; it was not saved")
+    return data
+
+
+def cmd_list(args, data, store):
+    if args.status == "Archived":
+        projects = [as_record(p) for week in sorted(archived_weeks()) for p in load_week(week)]
+    else:
+        projects = data["projects"]
+    projects = filter_projects(projects, args.status, args.recurrence, args.search or "", args.sort)
+    if args.limit:
+        projects = projects[:args.limit]
+    emit(args, [{field: p.get(field) for field in PROJECT_FIELDS} for p in projects],
+         [project_line(p) for p in projects] or ["No projects"])
+
+
+def cmd_due(args, data, store):
+    due = due_soon(data["projects"], args.days)
+    lines = [
+        notification_message(p, days_left) if days_left >= 0
+        else f"'{p['name']}' is overdue by {-days_left} days ({p['due_date']})"
+        for p, days_left in due
+    ]
+    emit(args, [dict({field: p.get(field) for field in PROJECT_FIELDS}, days_left=days_left)
+                for p, days_left in due],
+         lines or [f"Nothing due in the next {args.days} days"])
+
+
+def cmd_stats(args, data, store):
+    stats = StatsEngine()
+    stats.set_archived(archived_count(), *archived_day_counts())
+    stats.rebuild(data["projects"])
+    figures = stats.summary()
+    figures["streaks"] = [
+        {"name": name, "recurrence": rec, "current": current, "best": best}
+        for name, rec, current, best in CompletionLedger().streaks() if best
+    ]
+    emit(args, figures, [
+        f"Total Projects: {figures['total']}",
+        f"Completed: {figures['completed']}",
+        f"Projects Due Last Week: {figures['due_last_7_days']}",
+        f"Due per Week (last 4): {' / '.join(str(n) for n in figures['due_per_week'])}",
+    ] + [
+        f"{s['name']}: {s['current']} {s['recurrence']} streak (best {s['best']})" for s in figures["streaks"]
+    ])
+
+
+def parse_project(line, args):
+    """A JSON object or a bare project name, with the command's defaults."""
+    line = line.strip()
+    if not line:
+        return None
+    fields = json.loads(line) if line.startswith("{") else {"name": line}
+    project = make_project(
+        str(fields.get("name", "")).strip(),
+        fields.get("category", args.category),
+        fields.get("due_date", args.due or ""),
+        fields.get("recurrence", args.recurrence),
+    )
+    if not project["name"]:
+        raise ValueError("project name cannot be empty")
+    if project["due_date"]:
+        date.fromisoformat(project["due_date"])
+    return project
+
+
+def cmd_add(args, data, store):
+    journal = args.journal
+    added = []
+    for number, line in enumerate(sys.stdin, 1):
+        try:
+            project = parse_project(line, args)
+        except ValueError as e:
+            print(f"Skipping line {number}: {e}", file=sys.stderr)
+            continue
+        if project is not None:
+            added.append(project)
+    if added:
+        # One batch record, replayed by the app on its next start
+        record = {"op": "batch", "records": [{"op": "add", "project": p} for p in added]}
+        if store:
+            store.apply(record)
+        else:
+            journal.append(record)
+    emit(args, [p["id"] for p in added], [f"Added {len(added)} projects"])
+
+
+def build_parser():
+    # --json is accepted before or after the command name
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--json", action="store_true", default=argparse.SUPPRESS,
+                        help="print JSON instead of text")
+    parser = argparse.ArgumentParser(description="TaskTeal without the GUI", parents=[output])
+    parser.add_argument("--dir", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="data directory (default: next to this script)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    listing = commands.add_parser("list", parents=[output], help="list, filter and search projects")
+    listing.add_argument("--status", default="All", choices=["All", "Active", "Completed", "Archived"])
+    listing.add_argument("--recurrence", default="All", choices=["All", "Daily", "Weekly", "Monthly"])
+    listing.add_argument("--search")
+    listing.add_argument("--sort", default="Name", choices=["Name", "Date", "Status", "Relevance"])
+    listing.add_argument("--limit", type=int)
+    listing.set_defaults(run=cmd_list)
+
+    due = commands.add_parser("due", parents=[output], help="open projects due soon or overdue")
+    due.add_argument("--days", type=int, default=7)
+    due.set_defaults(run=cmd_due)
+
+    stats = commands.add_parser("stats", parents=[output], help="totals, due counts and streaks")
+    stats.set_defaults(run=cmd_stats)
+
+    add = commands.add_parser("add", parents=[output], help="add projects from stdin, one name or JSON object per line")
+    add.add_argument("--category", default="General", choices=["General", "Work", "Personal", "Hobby"])
+    add.add_argument("--due", help="due date (YYYY-MM-DD) for lines that do not set one")
+    add.add_argument("--recurrence", default="None", choices=["None", "Daily", "Weekly", "Monthly"])
+    add.set_defaults(run=cmd_add)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.json = getattr(args, "json", False)
+    args.out = sys.stdout
+    # The app keeps every file relative to its working directory
+    os.chdir(args.dir)
+    args.journal = Journal()
+    store = open_project_store()
+    try:
+        # Messages from the data layer go to stderr so --json output stays parseable
+        with contextlib.redirect_stdout(sys.stderr):
+            data = load(args.journal, store)
+            args.run(args, data, store)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if store:
+            store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
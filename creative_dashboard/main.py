@@ -1,23 +1,61 @@
+import time
+
+STARTUP_T0 = time.perf_counter()
+
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, SlideTransition
 from kivy.lang import Builder
-from kivy.uix.screenmanager import Screen
 from kivy.uix.label import Label
+from kivy.uix.recycleview import RecycleView
 from kivy.core.window import Window
 from kivy.factory import Factory
 from kivy.clock import Clock
+from kivy.properties import BooleanProperty
+from kivy.uix.textinput import TextInput
+from utils.text_cache import TEXT_TEXTURES
 from screens.home import HomeScreen
-from screens.project import ProjectScreen
-from screens.settings import SettingsScreen
-from screens.stats import StatsScreen
-from datetime import datetime, timedelta
 from plyer import notification
+from utils.journal import Journal
+from utils.saver import BackgroundSaver
+from utils.schema import DEFAULT_SETTINGS, SCHEMA_VERSION, migrate
+from utils.snapshot_cache import write_cache
+from utils.filelock import DATA_LOCK
+from utils.loader import DATA_FILE, data_stamp, load_app_data, open_project_store, snapshot_data, write_snapshot
+from utils.merge import apply_external, merge_snapshot
+from utils.undo import UndoStack
+import importlib
+from contextlib import contextmanager
+from utils.project_index import ProjectIndex, project_id_of
+from utils.project_record import as_record
+from utils.search_index import SearchIndex
+from utils.history_store import HistoryStore, HISTORY_LIMIT
+from utils.deadlines import DeadlineScheduler, notification_message
+from utils.stats_engine import StatsEngine
+from utils.recurrence import CompletionLedger
+from utils.profiler import PROFILER, PROFILE_FROM_ENV, TRACE_FILE, timed
+from utils.data_manager import (archive_projects, archived_count, archived_day_counts, archived_weeks, clear_archive,
+                                 load_week, purge_archive, restore_archive)
 import json
 import os
 
+KV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "KV")
+
+# Screens other than home are imported, given their KV rules and built the
+# first time they are navigated to
+LAZY_SCREENS = {
+    "project": ("screens.project", "ProjectScreen", "project.kv"),
+    "settings": ("screens.settings", "SettingsScreen", "settings.kv"),
+    "stats": ("screens.stats", "StatsScreen", "stats.kv"),
+}
+
+PROFILE_OVERLAY_INTERVAL = 1.0  # Seconds between debug overlay refreshes
+
+SAVE_DELAY = 0.5  # Seconds of quiet before a requested snapshot is captured
+WATCH_INTERVAL = 2.0  # Seconds between checks for other writers' changes
+
 # Register CustomButton for Python access
 Builder.load_string("""
-<CustomButton@Button>:
+<CustomButton@CachedButton>:
     font_name: 'assets/fonts/seguiemj.ttf'
     font_size: str(root.font_size * 1.0) + 'sp'
     size_hint: None, None
@@ -49,113 +87,430 @@ Builder.load_string("""
         PopMatrix:
 """)
 
-Builder.load_file("kv/home.kv")
-Builder.load_file("kv/project.kv")
-Builder.load_file("kv/settings.kv")
-Builder.load_file("kv/stats.kv")
+Builder.load_file(os.path.join(KV_DIR, "home.kv"))
+
+class LazyScreenManager(ScreenManager):
+    def get_screen(self, name):
+        if name not in self.screen_names and name in LAZY_SCREENS:
+            self.build_screen(name)
+        return super().get_screen(name)
+
+    def has_screen(self, name):
+        return name in self.screen_names or name in LAZY_SCREENS
+
+    def build_screen(self, name):
+        started = time.perf_counter()
+        module_name, class_name, kv_file = LAZY_SCREENS[name]
+        screen_class = getattr(importlib.import_module(module_name), class_name)
+        Builder.load_file(os.path.join(KV_DIR, kv_file))
+        screen = screen_class(name=name)
+        self.add_widget(screen)
+        print(f"Built '{name}' screen in {(time.perf_counter() - started) * 1000:.1f} ms")
+        App.get_running_app().on_screen_built(screen)
+        return screen
 
 class MainApp(App):
+    can_undo = BooleanProperty(False)
+    can_redo = BooleanProperty(False)
+
     def build(self):
+        self.startup_timings = {"imports": time.perf_counter() - STARTUP_T0}
+        self.journal = Journal()
+        self._batch = None
+        self.saver = BackgroundSaver(self.write_snapshot)
+        self._save_trigger = Clock.create_trigger(self.submit_snapshot, SAVE_DELAY)
+        self.project_store = open_project_store()
+        self.history_store = HistoryStore()
+        self.schema_migrated = False
+        self.data_stamp = None  # app_data.json as last loaded, written or merged
+        self._snapshot_skipped = False
+        self._stopped = False
         self.app_data = self.load_data()
-        sm = ScreenManager(transition=SlideTransition(duration=0.3))
+        self.startup_timings["load_data"] = time.perf_counter() - STARTUP_T0
+        self.history_store.limit = self.app_data["settings"].get("history_limit", HISTORY_LIMIT)
+        self.archive_cache = None
+        self.archive_set_aside = []  # One key per reset, for undo
+        # Completed work from past weeks leaves the hot list for weekly archive files
+        self.app_data["projects"], archived = archive_projects(self.app_data.get("projects", []))
+        if archived:
+            print(f"Archived {archived} completed projects from past weeks")
+        if self.schema_migrated or archived:
+            # Persist the migrated records so the migration runs only once
+            self.save_data()
+        self.change_listeners = []
+        # Registered first so listeners after it can already resolve IDs
+        self.project_index = ProjectIndex(self.app_data["projects"])
+        self.bind_changes(self.project_index.on_change)
+        self.search_index = SearchIndex(post=lambda callback: Clock.schedule_once(lambda dt: callback(), 0))
+        self.search_index.on_ready = self.on_search_index_ready
+        self.bind_changes(self.search_index.on_change)
+        self.bind_changes(self.history_store.on_change)
+        self.stats = StatsEngine()
+        self.stats.set_archived(archived_count(), *archived_day_counts())
+        self.stats.rebuild(self.app_data.get("projects", []))
+        self.bind_changes(self.stats.on_change)
+        self.ledger = CompletionLedger()
+        self.bind_changes(self.ledger.on_change)
+        self._deadline_event = None
+        self.deadlines = DeadlineScheduler(self.notify_deadline, self.arm_deadline_timer)
+        self.bind_changes(self.deadlines.on_change)
+        self.undo = UndoStack(self)
+        self.undo.on_state = self.on_undo_state
+        self.font_sizes = None
+        self.scale_version = 0
+        self.scaled_versions = {}
+        self.widget_roles = {}
+        self._resize_trigger = Clock.create_trigger(self.apply_scaling, -1)
+        self._frame_event = None
+        self._overlay_event = None
+        self.profile_overlay = None
+        sm = LazyScreenManager(transition=SlideTransition(duration=0.3))
         sm.add_widget(HomeScreen(name="home"))
-        sm.add_widget(ProjectScreen(name="project"))
-        sm.add_widget(SettingsScreen(name="settings"))
-        sm.add_widget(StatsScreen(name="stats"))
+        # Screens that were hidden during a resize catch up when shown
+        sm.bind(current_screen=lambda manager, screen: self.scale_screen(screen))
         Window.bind(on_resize=self.on_window_resize)
+        Window.bind(on_keyboard=self.on_keyboard)
+        self.startup_timings["build"] = time.perf_counter() - STARTUP_T0
         return sm
 
+    def on_search_index_ready(self):
+        # A Relevance search shown from a scan lacks the ranking and fuzzy matches
+        if self.root and "project" in self.root.screen_names:
+            screen = self.root.get_screen("project")
+            if screen.search_text and screen.sort_by == "Relevance":
+                screen.update_project_list()
+
+    def on_screen_built(self, screen):
+        settings = self.root.get_screen("settings") if "settings" in self.root.screen_names else None
+        if settings is not None and settings is not screen and settings._theme_applied:
+            settings.apply_theme()
+
+    def report_startup(self, dt):
+        self.startup_timings["first_frame"] = time.perf_counter() - STARTUP_T0
+        print("Startup timing: " + ", ".join(
+            f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in self.startup_timings.items()
+        ))
+
     def on_start(self):
+        # Runs before the next frame is drawn, so this marks the first frame
+        Clock.schedule_once(self.report_startup, 0)
         Clock.schedule_once(lambda dt: self.on_window_resize(Window, Window.size[0], Window.size[1]), 0)
-        Clock.schedule_interval(self.schedule_notifications, 86400)  # Check daily
+        # Off the UI thread, after the first frame; searches scan until it is ready
+        Clock.schedule_once(lambda dt: self.search_index.ensure_built(self.app_data["projects"]), 0)
+        # Builds the deadline heap; catches up on anything missed while closed
+        self.deadlines.rebuild(self.app_data.get("projects", []))
+        self.schedule_notifications(0)
+        self.set_profiling(self.app_data["settings"].get("profiling", False))
+        if not self.project_store:
+            # SQLite does its own locking; the JSON files are shared by hand
+            Clock.schedule_interval(self.check_external_changes, WATCH_INTERVAL)
+
+    def on_resume(self):
+        self.check_external_changes()
+        self.schedule_notifications(0)
 
+    def arm_deadline_timer(self, delay):
+        if self._deadline_event:
+            self._deadline_event.cancel()
+        self._deadline_event = Clock.schedule_once(self.schedule_notifications, delay)
+
+    @timed("schedule_notifications")
     def schedule_notifications(self, dt):
-        if not self.app_data.get("settings", {}).get("notifications", True):
-            return
-        today = datetime.now().date()
-        for project in self.app_data.get("projects", []):
-            due_date_str = project.get("due_date", "")
-            if not due_date_str:
-                continue
-            try:
-                due_date = datetime.strptime(due_date_str, "%Y-%m-%d").date()
-                days_left = (due_date - today).days
-                if days_left == 7:
-                    notification.notify(
-                        title="Creative Dashboard",
-                        message=f"'{project['name']}' is due in 1 week ({due_date_str})",
-                        app_name="Creative Dashboard",
-                        timeout=10
-                    )
-                elif days_left == 2:
-                    notification.notify(
-                        title="Creative Dashboard",
-                        message=f"'{project['name']}' is due in 2 days ({due_date_str})",
-                        app_name="Creative Dashboard",
-                        timeout=10
-                    )
-                elif days_left == 0:
-                    notification.notify(
-                        title="Creative Dashboard",
-                        message=f"'{project['name']}' is due today ({due_date_str})",
-                        app_name="Creative Dashboard",
-                        timeout=10
-                    )
-            except ValueError:
-                print(f"Invalid due date for '{project['name']}': {due_date_str}")
+        enabled = self.app_data.get("settings", {}).get("notifications", True)
+        self.deadlines.run(enabled=enabled)
+
+    def notify_deadline(self, project, days_left):
+        try:
+            notification.notify(
+                title="Creative Dashboard",
+                message=notification_message(project, days_left),
+                app_name="Creative Dashboard",
+                timeout=10
+            )
+        except Exception as e:
+            print(f"Error sending notification: {e}")
 
     def load_data(self):
-        data_file = "app_data.json"
         try:
-            if os.path.exists(data_file):
-                with open(data_file, "r") as f:
-                    data = json.load(f)
-                    if "projects" in data and data["projects"]:
-                        validated_projects = []
-                        for p in data["projects"]:
-                            if isinstance(p, dict) and "name" in p:
-                                p.setdefault("status", "Not Started")
-                                p.setdefault("emoji", "📌")
-                                p.setdefault("recurrence", "None")
-                                p.setdefault("history", [])
-                                p.setdefault("due_date", "")
-                                validated_projects.append(p)
-                            elif isinstance(p, str):
-                                print(f"Converting string project '{p}' to dictionary")
-                                validated_projects.append({
-                                    "name": p,
-                                    "category": "General",
-                                    "status": "Not Started",
-                                    "emoji": "📌",
-                                    "recurrence": "None",
-                                    "due_date": "",
-                                    "history": []
-                                })
-                            else:
-                                print(f"Skipping invalid project entry: {p}")
-                        data["projects"] = validated_projects
-                    if "settings" not in data:
-                        data["settings"] = {"theme": "System Default", "notifications": True, "font_scale": "Medium"}
-                    return data
-            return {
-                "projects": [], 
-                "settings": {"theme": "System Default", "notifications": True, "font_scale": "Medium"}
-            }
+            with DATA_LOCK:
+                data, self.schema_migrated = load_app_data(self.journal, self.history_store, self.project_store)
+                self.data_stamp = data_stamp(DATA_FILE)
+            return data
         except Exception as e:
             print(f"Error loading data: {e}")
-            return {
-                "projects": [], 
-                "settings": {"theme": "System Default", "notifications": True, "font_scale": "Medium"}
-            }
+            return {"projects": [], "settings": dict(DEFAULT_SETTINGS), "schema_version": SCHEMA_VERSION}
+
+    def load_archive(self):
+        """Archived projects from every week, read the first time they are viewed."""
+        if self.archive_cache is None:
+            self.archive_cache = [as_record(p) for week in sorted(archived_weeks()) for p in load_week(week)]
+            for project in self.archive_cache:
+                # Weeks archived before projects had IDs; only needed to key the rows
+                project_id_of(project)
+        return self.archive_cache
 
+    def clear_archive(self):
+        # None too, so each undone reset pops its own entry
+        self.archive_set_aside.append(clear_archive())
+        self.archive_cache = None
+        self.stats.set_archived()
+
+    @timed("save_data")
     def save_data(self):
+        """Request a full snapshot; requests close together share one write."""
+        if self.project_store:
+            try:
+                self.project_store.replace_all(self.app_data)
+            except Exception as e:
+                print(f"Error saving data: {e}")
+            return
+        self._save_trigger()
+
+    def submit_snapshot(self, *args, durable=False):
+        # The snapshot must include every record up to journal_seq, ours or not
+        self.check_external_changes()
+        data = snapshot_data(self.app_data, self.journal.consumed)
+        self.journal.pending = 0
+        self.saver.submit((data, durable))
+
+    @timed("write_snapshot")
+    def write_snapshot(self, job):
+        """Runs on the saver thread: serialize, replace atomically, trim the journal."""
+        data, durable = job
+        policy = data["settings"].get("fsync", "always")
+        # Before the lock: edits on the UI thread wait for it to journal
+        text = json.dumps(data)
+        # data_stamp is also checked by the merge under this lock
+        with DATA_LOCK:
+            stamp = write_snapshot(data, self.journal, self.data_stamp,
+                                   fsync=policy == "always" or (durable and policy == "exit"), text=text)
+            if stamp is None:
+                # Our records stay in the journal; saved again once merged
+                print("app_data.json was changed by another writer; saving after merging it")
+                self._snapshot_skipped = True
+            else:
+                self.data_stamp = stamp
+
+    def check_external_changes(self, *args):
+        """Merge what other instances, the CLI or sync tools wrote since the last check.
+
+        Polling costs a stat of each file; new journal lines are read
+        incrementally and app_data.json is only parsed when it was replaced.
+        """
+        if self.project_store:
+            return
+        if data_stamp(DATA_FILE) == self.data_stamp and not self.journal.has_unread():
+            return
+        changes = []
+        merged_snapshot = False
         try:
-            with open("app_data.json", "w") as f:
-                json.dump(self.app_data, f)
+            # Held throughout so nobody compacts between the snapshot and the journal
+            with DATA_LOCK:
+                stamp = data_stamp(DATA_FILE)
+                if stamp != self.data_stamp and stamp is not None:
+                    # Replaced, maybe trimming records we never read: rebuild what a
+                    # fresh load would see and apply only the differences
+                    with open(DATA_FILE, "r") as f:
+                        latest = json.load(f)
+                    migrate(latest, self.history_store)
+                    latest = self.journal.replay(latest, after=latest.pop("journal_seq", 0))
+                    merge_snapshot(self.app_data, self.project_index, latest, changes)
+                    merged_snapshot = True
+                self.data_stamp = stamp
+                for record in self.journal.read_new():
+                    apply_external(self.app_data, self.project_index, record, changes)
         except Exception as e:
-            print(f"Error saving data: {e}")
+            print(f"Error merging external changes: {e}")
+        for op, project in changes:
+            self.notify_change(op, project)
+        if changes:
+            self.refresh_screens({op for op, _ in changes})
+        if merged_snapshot and self._snapshot_skipped:
+            self._snapshot_skipped = False
+            self.save_data()
+
+    def refresh_screens(self, ops):
+        """Update the screens that show data changed behind their back (merge, undo)."""
+        if not self.root:
+            return
+        if "settings" in ops:
+            settings = self.app_data["settings"]
+            self.history_store.limit = settings.get("history_limit", HISTORY_LIMIT)
+            self.set_profiling(settings.get("profiling", False))
+            self._resize_trigger()
+            if "settings" in self.root.screen_names:
+                screen = self.root.get_screen("settings")
+                screen.load_settings()
+                if screen._theme_applied:
+                    screen.apply_theme()
+        if ops - {"settings"}:
+            if "project" in self.root.screen_names:
+                self.root.get_screen("project").update_project_list()
+            current = self.root.current_screen
+            if current.name == "home":
+                current.on_pre_enter()
+            elif current.name == "stats":
+                current.on_enter()
+
+    def get_project(self, project_id):
+        """The live project with ``project_id``, or None (deleted or archived)."""
+        return self.project_index.get(project_id)
+
+    def add_project(self, project):
+        self.project_index.append(project)
+        self.record_change("add", target=project, project=project)
+        return project["id"]
+
+    def delete_project(self, project_id):
+        project = self.project_index.remove(project_id)
+        if project is not None:
+            self.record_change("delete", target=project, id=project_id)
+        return project
+
+    def delete_projects(self, project_ids):
+        """Delete several projects with one pass over the list and one record."""
+        with self.transaction():
+            removed = self.project_index.remove_many(project_ids)
+            if removed:
+                self.record_change("delete_many", before=removed, ids=[p["id"] for p in removed])
+                for project in removed:
+                    self.notify_change("delete", project)
+        return removed
 
+    def reset_projects(self):
+        """Clear every project, the archive and the ledger; undo brings all of them back."""
+        before = self.app_data["projects"]
+        self.app_data["projects"] = []
+        self.clear_archive()
+        self.record_change("reset", before=before)
+
+    def restore_projects(self, projects):
+        """Put a whole project list back in one step instead of one change per project."""
+        restored = {p["id"] for p in projects}
+        # Keep anything added since, e.g. by another instance
+        projects.extend(p for p in self.app_data["projects"] if p["id"] not in restored)
+        self.app_data["projects"] = projects
+        if self.archive_set_aside:
+            # Undoing a reset: the archive it cleared comes back as well
+            key = self.archive_set_aside.pop()
+            if key:
+                restore_archive(key)
+                self.archive_cache = None
+                self.stats.set_archived(archived_count(), *archived_day_counts())
+        self.write_change({"op": "batch", "records": [
+            {"op": "add", "project": p} for p in projects if p["id"] in restored
+        ]})
+        self.notify_change("reload")
+
+    def purge_set_aside(self):
+        """Remove the files deletes and resets kept for undo, which does not outlive the app."""
+        self.history_store.purge()
+        self.ledger.purge()
+        for key in filter(None, self.archive_set_aside):
+            purge_archive(key)
+        self.archive_set_aside.clear()
+
+    def undo_change(self):
+        # Screens reloading the restored values must not record new steps
+        with self.undo.replay():
+            self.refresh_screens(self.undo.undo())
+
+    def redo_change(self):
+        with self.undo.replay():
+            self.refresh_screens(self.undo.redo())
+
+    def on_undo_state(self, can_undo, can_redo):
+        self.can_undo = can_undo
+        self.can_redo = can_redo
+
+    def on_keyboard(self, window, key, scancode, codepoint, modifiers):
+        if not ({"ctrl", "meta"} & set(modifiers)) or codepoint not in ("z", "y"):
+            return False
+        screen = self.root.current_screen if self.root else None
+        if screen is None or any(isinstance(w, TextInput) and w.focus for w in screen.walk()):
+            # Text fields have their own undo
+            return False
+        if codepoint == "y" or "shift" in modifiers:
+            self.redo_change()
+        else:
+            self.undo_change()
+        return True
+
+    def bind_changes(self, callback):
+        """Register ``callback(op, project, app_data)`` for every data change."""
+        self.change_listeners.append(callback)
+
+    def notify_change(self, op, project=None):
+        for callback in self.change_listeners:
+            try:
+                callback(op, project, self.app_data)
+            except Exception as e:
+                print(f"Error handling {op} change: {e}")
+
+    def record_change(self, op, target=None, before=None, **payload):
+        """Persist a single mutation to the journal or the SQLite store.
+
+        ``target`` is the project the change applies to; it is passed to
+        change listeners but is not written out itself. ``before`` is what
+        the change replaced, kept for undo: the old fields of an update, the
+        old settings, the projects a delete_many or reset removed.
+        """
+        payload["op"] = op
+        self.write_change(payload)
+        self.undo.capture(op, target, before, payload)
+        self.notify_change(op, target)
+
+    def write_change(self, payload):
+        if self._batch is not None:
+            self._batch.append(payload)
+        else:
+            self.persist(payload)
+
+    @contextmanager
+    def transaction(self):
+        """Persist every change recorded inside the block as one batch record.
+
+        Listeners still hear about each change as it is recorded, but the
+        journal gets a single line (SQLite a single transaction), so a crash
+        keeps all of the batch or none of it. Nested blocks join the outer one.
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = []
+        self.undo.begin()
+        try:
+            yield
+        finally:
+            # Written even if the block raised, so disk matches what was applied
+            records, self._batch = self._batch, None
+            if records:
+                self.persist({"op": "batch", "records": records})
+            self.undo.end()
+
+    def persist(self, payload):
+        if self.project_store:
+            try:
+                self.project_store.apply(payload)
+            except Exception as e:
+                print(f"Error writing store: {e}")
+                self.save_data()
+        else:
+            try:
+                if self.journal.append(payload):
+                    self.save_data()
+            except Exception as e:
+                print(f"Error writing journal: {e}")
+                self.save_data()
+
+    @timed("on_window_resize")
     def on_window_resize(self, window, width, height):
+        # Resize events come in bursts while dragging; apply once per frame
+        self._resize_trigger()
+
+    @timed("apply_scaling")
+    def apply_scaling(self, *args):
+        width, height = Window.size
         scale = min(width / 1920, height / 1080) * 1.1
         font_scale = {"Small": 14/16, "Medium": 16/16, "Large": 18/16, "ExtraLarge": 20/16}.get(
             self.app_data.get("settings", {}).get("font_scale", "Medium"), 16/16
@@ -163,24 +518,113 @@ class MainApp(App):
         base_font_size = 24  # 1.5x from 16
         base_header_size = 54  # 1.5x from 36
         base_button_size = 30  # 1.5x from 20
+        font_sizes = {
+            "text": base_font_size * scale * font_scale,
+            "header": base_header_size * scale * font_scale,
+            "button": base_button_size * scale * font_scale,
+        }
+        if font_sizes == self.font_sizes:
+            return
+        self.font_sizes = font_sizes
+        self.scale_version += 1
+        # Captions at the old sizes will not be drawn again
+        TEXT_TEXTURES.clear()
         if self.root:
-            for screen in self.root.screens:
-                screen.font_size = base_font_size * scale * font_scale
-                for widget in screen.walk():
-                    if hasattr(widget, 'font_size'):
-                        if isinstance(widget, Label) and 'header' in widget.text.lower():
-                            widget.font_size = f'{base_header_size * scale * font_scale}sp'
-                        elif isinstance(widget, Factory.CustomButton):
-                            widget.font_size = f'{base_button_size * scale * font_scale}sp'
-                        else:
-                            widget.font_size = f'{base_font_size * scale * font_scale}sp'
-                    if hasattr(widget, 'padding') and isinstance(widget, Screen):
-                        widget.padding = 20 if width < 1400 else 30
-                    if hasattr(widget, 'spacing') and isinstance(widget, Screen):
-                        widget.spacing = 15 if width < 1400 else 20
+            self.scale_screen(self.root.current_screen)
+
+    def scale_screen(self, screen):
+        if (screen is None or self.font_sizes is None
+                or self.scaled_versions.get(screen.name) == self.scale_version):
+            return
+        self.scaled_versions[screen.name] = self.scale_version
+        screen.font_size = self.font_sizes["text"]
+        for widget, role in self.get_widget_roles(screen):
+            widget.font_size = f'{self.font_sizes[role]}sp'
+
+    def get_widget_roles(self, screen):
+        """Classify a screen's sized widgets once, by type and layout rather than text."""
+        roles = self.widget_roles.get(screen.name)
+        if roles is None:
+            roles = []
+            stack = list(screen.children)
+            while stack:
+                widget = stack.pop()
+                if isinstance(widget, RecycleView):
+                    # Recycled rows follow the screen's font_size through their data
+                    continue
+                if hasattr(widget, 'font_size'):
+                    if isinstance(widget, Factory.CustomButton):
+                        roles.append((widget, "button"))
+                    elif isinstance(widget, Label) and widget.bold and widget.halign == 'center':
+                        roles.append((widget, "header"))
+                    else:
+                        roles.append((widget, "text"))
+                stack.extend(widget.children)
+            self.widget_roles[screen.name] = roles
+        return roles
+
+    def set_profiling(self, enabled):
+        """Turn timers, frame timing and the debug overlay on or off."""
+        enabled = bool(enabled) or PROFILE_FROM_ENV
+        PROFILER.enabled = enabled
+        if enabled and self._frame_event is None:
+            self._frame_event = Clock.schedule_interval(self.record_frame, 0)
+            self._overlay_event = Clock.schedule_interval(self.update_profile_overlay, PROFILE_OVERLAY_INTERVAL)
+            self.profile_overlay = Label(
+                size_hint=(None, None), halign='left', valign='top',
+                color=[1, 0.3, 0.3, 1], font_size='12sp'
+            )
+            self.profile_overlay.bind(texture_size=self.profile_overlay.setter('size'))
+            Window.add_widget(self.profile_overlay)
+        elif not enabled and self._frame_event is not None:
+            self._frame_event.cancel()
+            self._overlay_event.cancel()
+            Window.remove_widget(self.profile_overlay)
+            self._frame_event = self._overlay_event = self.profile_overlay = None
+
+    def record_frame(self, dt):
+        # dt is the time since the previous tick, i.e. the last frame's duration
+        now = time.perf_counter()
+        PROFILER.record("frame", now - dt, now)
+
+    def update_profile_overlay(self, dt):
+        overlay = self.profile_overlay
+        overlay.text = "\n".join(
+            f"{name}: n={calls} p50 {p50:.1f} p95 {p95:.1f} p99 {p99:.1f} ms"
+            for name, calls, p50, p95, p99 in PROFILER.summary()
+        )
+        overlay.pos = (10, Window.height - overlay.height - 10)
 
     def on_stop(self):
-        self.save_data()
+        # Kivy can dispatch on_stop more than once; the saver is gone after the first
+        if self._stopped:
+            return
+        self._stopped = True
+        if PROFILER.histograms:
+            try:
+                PROFILER.dump(TRACE_FILE)
+                print(f"Profiling trace written to {TRACE_FILE}")
+            except Exception as e:
+                print(f"Error writing profiling trace: {e}")
+        self.purge_set_aside()
+        if self.project_store:
+            # Every change is already committed; nothing to compact
+            self.project_store.close()
+            return
+        # Flush-on-exit: capture now and wait for the write to land
+        self._save_trigger.cancel()
+        self.submit_snapshot(durable=True)
+        if not self.saver.close():
+            print("Final save did not finish; the journal still holds every change")
+            return
+        if self.data_stamp is None or self.data_stamp != data_stamp(DATA_FILE):
+            # Another writer's snapshot is on disk, not ours
+            return
+        try:
+            # Lets the next launch skip JSON parsing and validation
+            write_cache(self.app_data, self.journal.consumed, DATA_FILE)
+        except Exception as e:
+            print(f"Error writing snapshot cache: {e}")
 
 if __name__ == "__main__":
     MainApp().run()
\ No newline at end of file
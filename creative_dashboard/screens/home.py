@@ -8,10 +8,9 @@ class HomeScreen(Screen):
 
     def on_pre_enter(self):
         try:
-            app = App.get_running_app()
-            projects = app.app_data.get("projects", [])
-            total = len(projects)
-            completed = len([p for p in projects if p.get("status") == "Completed"])
+            stats = App.get_running_app().stats
+            total = stats.total
+            completed = stats.completed
             self.progress_summary = f"{completed}/{total} projects completed 📈" if total > 0 else "No projects yet! 📋"
         except Exception as e:
             print(f"Error updating home: {e}")
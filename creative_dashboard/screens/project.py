@@ -1,15 +1,22 @@
 from kivy.uix.screenmanager import Screen
-from kivy.properties import StringProperty, NumericProperty
+from kivy.properties import StringProperty, NumericProperty, BooleanProperty
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
 from kivy.uix.label import Label
 from kivy.uix.popup import Popup
 from kivy.uix.textinput import TextInput
 from kivy.uix.spinner import Spinner
+from kivy.uix.scrollview import ScrollView
 from kivy.factory import Factory
 from kivy.app import App
 from kivy.clock import Clock
 from kivy.graphics import Color, Rectangle
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from utils.profiler import timed
+from utils.project_index import make_project
+from utils.queries import filter_projects
+from utils.reconcile import reconcile
+from utils.recurrence import next_occurrence
 import re
 
 class CenteredTextInput(TextInput):
@@ -27,6 +34,30 @@ class CenteredTextInput(TextInput):
                 pos_y = self.center_y - self.font_size / 2
                 Rectangle(pos=(pos_x, pos_y), size=(text_width, self.font_size))
 
+class ProjectRow(RecycleDataViewBehavior, BoxLayout):
+    # One recycled row of the project RecycleView; fields come from its data dict
+    text = StringProperty("")
+    font_size = NumericProperty(16)
+    project_id = StringProperty("")
+    selected = BooleanProperty(False)
+    index = None
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.index = index
+        return super().refresh_view_attrs(rv, index, data)
+
+    def select(self, value):
+        if self.project_id and self.index is not None:
+            App.get_running_app().root.get_screen("project").set_selected(self.project_id, self.index, value)
+
+    def edit(self):
+        if self.project_id:
+            App.get_running_app().root.get_screen("project").show_edit_popup(self.project_id)
+
+    def delete(self):
+        if self.project_id:
+            App.get_running_app().root.get_screen("project").delete_project(self.project_id)
+
 class ProjectScreen(Screen):
     category = StringProperty("General")
     due_date = StringProperty("")
@@ -36,10 +67,13 @@ class ProjectScreen(Screen):
     filter_status = StringProperty("All")
     filter_recurrence = StringProperty("All")
     font_size = NumericProperty(16)
+    selected_count = NumericProperty(0)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.bind(search_text=self.update_project_list)
+        self.selection = set()  # IDs of the selected projects
+        self._search_trigger = Clock.create_trigger(self.update_project_list, 0.15)
+        self.bind(font_size=Clock.create_trigger(self.update_project_list))
         self.bind(sort_by=self.update_project_list)
         self.bind(filter_status=self.update_project_list)
         self.bind(filter_recurrence=self.update_project_list)
@@ -65,7 +99,9 @@ class ProjectScreen(Screen):
 
     def set_search_text(self, value):
         self.search_text = value.lower()
-        Clock.schedule_once(lambda dt: self.update_project_list(), 0.1)
+        # Debounce: every keystroke pushes the pending search back
+        self._search_trigger.cancel()
+        self._search_trigger()
 
     def set_sort_by(self, value):
         self.sort_by = value
@@ -86,17 +122,7 @@ class ProjectScreen(Screen):
             return
         app = App.get_running_app()
         due_date = self.due_date  # No default to today
-        project = {
-            "name": name,
-            "category": self.category,
-            "status": "Not Started",
-            "emoji": "📌",
-            "due_date": due_date,
-            "recurrence": self.recurrence,
-            "history": []
-        }
-        app.app_data["projects"] = app.app_data.get("projects", []) + [project]
-        app.save_data()
+        app.add_project(make_project(name, self.category, due_date, self.recurrence))
         self.project_input.text = ""
         self.due_date = ""
         self.due_date_input.text = ""
@@ -104,76 +130,151 @@ class ProjectScreen(Screen):
         self.recurrence_spinner.text = "None"
         self.update_project_list()
 
-    def delete_project(self, project):
-        app = App.get_running_app()
-        projects = app.app_data.get("projects", [])
-        if project in projects:
-            projects.remove(project)
-            app.app_data["projects"] = projects
-            app.save_data()
+    def delete_project(self, project_id):
+        if App.get_running_app().delete_project(project_id) is not None:
+            self.selection.discard(project_id)
+            self.selected_count = len(self.selection)
             self.update_project_list()
 
-    def reset_projects(self):
+    def set_selected(self, project_id, row, value):
+        if value:
+            self.selection.add(project_id)
+        else:
+            self.selection.discard(project_id)
+        self.selected_count = len(self.selection)
+        # Keep the row's data in step so a recycled widget shows the right state
+        rows = self.project_list.data
+        if row < len(rows) and rows[row]["project_id"] == project_id:
+            rows[row]["selected"] = value
+
+    def toggle_select_all(self):
+        rows = self.project_list.data
+        if self.filter_status == "Archived":
+            return
+        keys = {row["project_id"] for row in rows}
+        if keys <= self.selection:
+            self.selection -= keys
+        else:
+            self.selection |= keys
+        self.selected_count = len(self.selection)
+        self.update_project_list()
+
+    def selected_projects(self):
+        """Every selected project that still exists, looked up by ID."""
         app = App.get_running_app()
-        app.app_data["projects"] = []
-        app.save_data()
+        return [p for p in map(app.get_project, self.selection) if p is not None]
+
+    def bulk_update(self, change):
+        """Apply ``change(project)`` to every selected project as one transaction."""
+        app = App.get_running_app()
+        selected = self.selected_projects()
+        if not selected:
+            return
+        with app.transaction():
+            for project in selected:
+                old_data = project.copy()
+                change(project)
+                if project != old_data:
+                    app.history_store.record(project, old_data, project)
+                    # Whole project, replaced on replay, so popped keys such as completed_on stay gone
+                    app.record_change("update", target=project, before=old_data, id=project["id"],
+                                      fields=project.copy(), replace=True)
         self.update_project_list()
 
+    def bulk_spinner(self, spinner, placeholder, action):
+        if spinner.text in spinner.values:
+            value = spinner.text
+            spinner.text = placeholder
+            action(value)
+
+    def set_selected_status(self, status):
+        today = datetime.now().date().isoformat()
+
+        def change(project):
+            previous = project.get("status")
+            project["status"] = status
+            if status == "Completed" and previous != "Completed":
+                project["completed_on"] = today
+                if project.get("recurrence", "None") != "None":
+                    self.complete_occurrence(project)
+            elif status != "Completed":
+                project.pop("completed_on", None)
+        self.bulk_update(change)
+
+    def set_selected_category(self, category):
+        self.bulk_update(lambda project: project.update(category=category))
+
+    def shift_selected_due_dates(self, days_text):
+        try:
+            days = timedelta(days=int(days_text))
+        except ValueError:
+            print("Shift must be a whole number of days")
+            return
+
+        def change(project):
+            # Projects without a due date have nothing to shift
+            if project.due_ordinal is not None:
+                project["due_date"] = (date.fromordinal(project.due_ordinal) + days).isoformat()
+        self.bulk_update(change)
+
+    def delete_selected(self):
+        if not self.selection:
+            return
+        App.get_running_app().delete_projects(self.selection)
+        self.selection.clear()
+        self.selected_count = 0
+        self.update_project_list()
+
+    def reset_projects(self):
+        App.get_running_app().reset_projects()
+        self.selection.clear()
+        self.selected_count = 0
+        self.update_project_list()
+
+    @timed("update_project_list")
     def update_project_list(self, *args):
         try:
-            self.project_list.clear_widgets()
             app = App.get_running_app()
             projects = app.app_data.get("projects", [])
             print(f"Updating project list with {len(projects)} projects")
-            filtered = [
-                p for p in projects
-                if (self.filter_status == "All" or
-                    (self.filter_status == "Active" and p.get("status") in ["Not Started", "In Progress"]) or
-                    (self.filter_status == "Completed" and p.get("status") == "Completed"))
-                and (self.filter_recurrence == "All" or p.get("recurrence") == self.filter_recurrence)
-                and (not self.search_text or self.search_text in p.get("name", "").lower())
-            ]
-            if self.sort_by == "Name":
-                filtered.sort(key=lambda x: x.get("name", "").lower())
-            elif self.sort_by == "Date":
-                filtered.sort(key=lambda x: x.get("due_date", "9999-12-31"))
-            elif self.sort_by == "Status":
-                filtered.sort(key=lambda x: ["Not Started", "In Progress", "Completed"].index(x.get("status", "Not Started")))
-
-            for project in filtered:
-                layout = BoxLayout(size_hint_y=None, height=48, spacing=10)
-                due_date = project.get("due_date", "No Due Date")
-                label = Label(
-                    text=f"📌 {project.get('name')} - Due: {due_date} [{project.get('status')}] [{project.get('recurrence')}]",
-                    font_name="assets/fonts/seguiemj.ttf",
-                    font_size=str(self.font_size) + 'sp',
-                    size_hint_x=0.6,
-                    color=[1, 1, 1, 1]
-                )
-                edit_btn = Factory.CustomButton(
-                    text="✏️ Edit",
-                    font_name="assets/fonts/seguiemj.ttf",
-                    font_size=str(self.font_size * 0.8) + 'sp',
-                    size_hint_x=0.2,
-                    size=(60, 45)
-                )
-                delete_btn = Factory.CustomButton(
-                    text="✖️ Delete",
-                    font_name="assets/fonts/seguiemj.ttf",
-                    font_size=str(self.font_size * 0.8) + 'sp',
-                    size_hint_x=0.2,
-                    size=(60, 45)
-                )
-                edit_btn.bind(on_press=lambda instance, p=project: self.show_edit_popup(p))
-                delete_btn.bind(on_press=lambda instance, p=project: self.delete_project(p))
-                layout.add_widget(label)
-                layout.add_widget(edit_btn)
-                layout.add_widget(delete_btn)
-                self.project_list.add_widget(layout)
+            if self.filter_status == "Archived":
+                filtered = self.filter_projects(app.load_archive())
+            elif app.project_store and not (self.sort_by == "Relevance" and self.search_text):
+                filtered = [app.get_project(key) for key in app.project_store.query(
+                    self.filter_status, self.filter_recurrence, self.search_text, self.sort_by
+                )]
+            else:
+                filtered = self.filter_projects(projects)
+            # The RecycleView only builds widgets for rows inside the viewport,
+            # and reconcile only rewrites the rows whose content moved or changed
+            reconcile(self.project_list.data, [self.row_data(project) for project in filtered])
         except Exception as e:
             print(f"Error updating project list: {e}")
 
-    def show_edit_popup(self, project):
+    def row_data(self, project):
+        due_date = project.get("due_date", "No Due Date")
+        return {
+            "text": f"📌 {project.get('name')} - Due: {due_date} [{project.get('status')}] [{project.get('recurrence')}]",
+            "font_size": self.font_size,
+            "project_id": project["id"],
+            "selected": project["id"] in self.selection,
+        }
+
+    def filter_projects(self, projects):
+        search_index = None
+        if self.search_text and self.filter_status != "Archived":
+            # The search index only covers the hot working set; until its
+            # worker is done the search scans
+            search_index = App.get_running_app().search_index
+            search_index.ensure_built(projects)
+        return filter_projects(projects, self.filter_status, self.filter_recurrence,
+                               self.search_text, self.sort_by, search_index)
+
+    def show_edit_popup(self, project_id):
+        project = App.get_running_app().get_project(project_id)
+        if project is None:
+            print("Archived projects are read-only")
+            return
         content = BoxLayout(orientation='vertical', spacing=10, padding=10)
         name_input = CenteredTextInput(
             text=project.get("name", ""),
@@ -215,11 +316,17 @@ class ProjectScreen(Screen):
         save_btn = Factory.CustomButton(
             text='Save',
             font_size=str(self.font_size) + 'sp',
-            on_press=lambda x: self.save_project(project, name_input.text, category_spinner.text, 
+            on_press=lambda x: self.save_project(project_id, name_input.text, category_spinner.text, 
                                                due_date_input.text, recurrence_spinner.text, 
                                                status_spinner.text, popup)
         )
+        history_btn = Factory.CustomButton(
+            text='🕘 History',
+            font_size=str(self.font_size) + 'sp',
+            on_press=lambda x: self.show_history_popup(project)
+        )
         buttons.add_widget(cancel_btn)
+        buttons.add_widget(history_btn)
         buttons.add_widget(save_btn)
         content.add_widget(Label(text="Edit Project", font_name="assets/fonts/seguiemj.ttf", font_size=str(self.font_size) + 'sp'))
         content.add_widget(name_input)
@@ -231,13 +338,65 @@ class ProjectScreen(Screen):
         popup = Popup(title='Edit Project', content=content, size_hint=(0.6, 0.7))
         popup.open()
 
-    def save_project(self, project, name, category, due_date, recurrence, status, popup):
+    def show_history_popup(self, project):
+        # History lives in its own store and is only read when asked for
+        entries = App.get_running_app().history_store.load_project(project)
+        lines = [
+            entry["timestamp"][:16].replace("T", " ") + ": " + ", ".join(
+                f"{field} {old!r} → {new!r}" for field, (old, new) in entry["changes"].items()
+            )
+            for entry in reversed(entries)
+        ] or ["No changes yet 📭"]
+        label = Label(
+            text="\n".join(lines),
+            font_name="assets/fonts/seguiemj.ttf",
+            font_size=str(self.font_size * 0.8) + 'sp',
+            size_hint_y=None,
+            halign='left',
+            valign='top'
+        )
+        label.bind(width=lambda instance, width: setattr(instance, 'text_size', (width, None)))
+        label.bind(texture_size=lambda instance, size: setattr(instance, 'height', size[1]))
+        scroll = ScrollView(do_scroll_x=False)
+        scroll.add_widget(label)
+        popup = Popup(title=f"History: {project.get('name', '')}", content=scroll, size_hint=(0.7, 0.7))
+        popup.open()
+
+    def complete_occurrence(self, project):
+        # Completing a recurring project logs this occurrence and moves the
+        # project on to its next one instead of leaving it Completed
+        app = App.get_running_app()
+        today = datetime.now().date()
+        occurrence = date.fromordinal(project.due_ordinal) if project.due_ordinal else today
+        anchor = project.setdefault("anchor_date", occurrence.isoformat())
+        entry = app.ledger.record(app.history_store.key_for(project), project["name"], project["recurrence"], occurrence)
+        if entry:
+            # Part of the caller's transaction, so undoing the edit takes it back
+            app.undo.capture_ledger(entry)
+        following = next_occurrence(
+            datetime.strptime(anchor, "%Y-%m-%d").date(), project["recurrence"], max(occurrence, today)
+        )
+        if following:
+            project["due_date"] = following.isoformat()
+            project["status"] = "Not Started"
+            project.pop("completed_on", None)
+
+    def save_project(self, project_id, name, category, due_date, recurrence, status, popup):
         try:
             if not name.strip():
                 print("Project name cannot be empty")
                 return
             app = App.get_running_app()
+            project = app.get_project(project_id)
+            if project is None:
+                # Deleted while the popup was open
+                popup.dismiss()
+                return
             old_data = project.copy()
+            if status == "Completed" and project.get("status") != "Completed":
+                project["completed_on"] = datetime.now().date().isoformat()
+            elif status != "Completed":
+                project.pop("completed_on", None)
             project["name"] = name.strip()
             project["category"] = category
             project["recurrence"] = recurrence
@@ -249,12 +408,14 @@ class ProjectScreen(Screen):
                 except ValueError:
                     project["due_date"] = ""
                     print("Invalid date format")
-            project["history"].append({
-                "timestamp": datetime.now().isoformat(),
-                "old": old_data,
-                "new": project.copy()
-            })
-            app.save_data()
+            # One undo step for the edit and the completion it logs
+            with app.transaction():
+                if recurrence != "None" and status == "Completed" and old_data.get("status") != "Completed":
+                    self.complete_occurrence(project)
+                app.history_store.record(project, old_data, project)
+                # Replaced on replay, as in bulk_update
+                app.record_change("update", target=project, before=old_data, id=project_id,
+                                  fields=project.copy(), replace=True)
             self.update_project_list()
             popup.dismiss()
         except Exception as e:
@@ -10,24 +10,44 @@ from kivy.core.window import Window
 from kivy.graphics import Color, Rectangle
 from kivy.uix.label import Label
 from kivy.uix.button import Button
-import json
+from kivy.uix.textinput import TextInput
+from utils.profiler import timed
+from utils.text_cache import TEXT_TEXTURES
+from utils.transfer import export_to, read_records, ProjectMerger
 import os
 import platform
-import winreg
+import threading
+import time
+
+IMPORT_FRAME_BUDGET = 0.008  # Seconds of import work per frame
 
 class SettingsScreen(Screen):
     theme = StringProperty("System Default")
     notifications = BooleanProperty(True)
+    profiling = BooleanProperty(False)
     font_scale = StringProperty("Medium")
     font_size = NumericProperty(16)
     _theme_applied = False
+    _loading = False
 
     def __init__(self, **kwargs):
+        # The KV rules set the widgets, whose handlers would save the defaults
+        self._loading = True
         super().__init__(**kwargs)
         self.app = App.get_running_app()
-        self.theme = self.app.app_data.get("settings", {}).get("theme", "System Default")
-        self.notifications = self.app.app_data.get("settings", {}).get("notifications", True)
-        self.font_scale = self.app.app_data.get("settings", {}).get("font_scale", "Medium")
+        self.load_settings()
+        self._loading = False
+
+    def load_settings(self):
+        # Showing stored values is not a change; keep the widgets' handlers from saving
+        loading, self._loading = self._loading, True
+        try:
+            self.theme = self.app.app_data.get("settings", {}).get("theme", "System Default")
+            self.notifications = self.app.app_data.get("settings", {}).get("notifications", True)
+            self.font_scale = self.app.app_data.get("settings", {}).get("font_scale", "Medium")
+            self.profiling = self.app.app_data.get("settings", {}).get("profiling", False)
+        finally:
+            self._loading = loading
 
     def on_pre_enter(self):
         try:
@@ -48,7 +68,11 @@ class SettingsScreen(Screen):
         Clock.schedule_once(lambda dt: self.app.on_window_resize(Window, Window.size[0], Window.size[1]), 0.1)
 
     def get_system_theme(self):
+        if platform.system() != "Windows":
+            return "Light"
         try:
+            # Only available on Windows, so imported when first needed
+            import winreg
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize")
             value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
             winreg.CloseKey(key)
@@ -57,6 +81,7 @@ class SettingsScreen(Screen):
             print(f"Error accessing system theme: {e}")
             return "Light"
 
+    @timed("apply_theme")
     def apply_theme(self):
         try:
             if not self.app.root:
@@ -65,13 +90,15 @@ class SettingsScreen(Screen):
             bg_color = [1, 1, 1, 1] if theme == "Light" else [0.1, 0.3, 0.3, 1]
             text_color = [0.2, 0.6, 1, 1] if theme == "Light" else [0.9, 0.9, 0.9, 1]
             button_color = [0.5, 0.5, 0.5, 1]
+            # Color is part of the cache key; drop textures in the old colors
+            TEXT_TEXTURES.clear()
             for screen in self.app.root.screens:
                 screen.canvas.before.clear()
                 with screen.canvas.before:
                     Color(*bg_color)
                     Rectangle(pos=screen.pos, size=screen.size)
                 for widget in screen.walk():
-                    if isinstance(widget, (Label, Button)) and not isinstance(widget, Factory.CenteredTextInput):
+                    if isinstance(widget, (Label, Button)) and not isinstance(widget, TextInput):
                         widget.color = text_color
                     if isinstance(widget, Factory.CustomButton):
                         widget.background_color = button_color
@@ -79,16 +106,24 @@ class SettingsScreen(Screen):
             print(f"Error applying theme: {e}")
 
     def save_settings(self):
-        self.app.app_data["settings"] = {
+        if self._loading:
+            return
+        before = dict(self.app.app_data.get("settings", {}))
+        # Update in place so keys such as history_limit survive
+        self.app.app_data.setdefault("settings", {}).update({
             "theme": self.theme,
             "notifications": self.notifications,
-            "font_scale": self.font_scale
-        }
-        self.app.save_data()
+            "font_scale": self.font_scale,
+            "profiling": self.profiling
+        })
+        if self.app.app_data["settings"] == before:
+            return
+        self.app.record_change("settings", before=before, settings=self.app.app_data["settings"])
+        self.app.set_profiling(self.profiling)
 
     def show_export_chooser(self):
         content = BoxLayout(orientation='vertical', spacing=10)
-        file_chooser = FileChooserListView(path=os.path.expanduser("~"), filters=["*.json"])
+        file_chooser = FileChooserListView(path=os.path.expanduser("~"), filters=["*.ndjson", "*.json"])
         buttons = BoxLayout(size_hint_y=None, height=45, spacing=10)
         cancel_btn = Factory.CustomButton(text='Cancel', font_size=str(self.font_size) + 'sp', on_press=lambda x: popup.dismiss())
         save_btn = Factory.CustomButton(text='Save', font_size=str(self.font_size) + 'sp', on_press=lambda x: self.export_data(file_chooser.path, popup))
@@ -101,16 +136,27 @@ class SettingsScreen(Screen):
 
     def export_data(self, path, popup):
         try:
-            file_path = os.path.join(path, "app_data.json")
-            with open(file_path, "w") as f:
-                json.dump(self.app_data, f)
+            file_path = os.path.join(path, "app_data.ndjson")
+            # Shallow copies give the export thread a consistent view
+            snapshot = {
+                "settings": dict(self.app.app_data.get("settings", {})),
+                "projects": [p.to_dict() for p in self.app.app_data.get("projects", [])]
+            }
+            threading.Thread(target=self.export_worker, args=(file_path, snapshot), daemon=True).start()
             popup.dismiss()
         except Exception as e:
             print(f"Error exporting data: {e}")
 
+    def export_worker(self, file_path, snapshot):
+        try:
+            export_to(file_path, snapshot)
+            print(f"Exported {len(snapshot['projects'])} projects to {file_path}")
+        except Exception as e:
+            print(f"Error exporting data: {e}")
+
     def show_import_chooser(self):
         content = BoxLayout(orientation='vertical', spacing=10)
-        file_chooser = FileChooserListView(path=os.path.expanduser("~"), filters=["*.json"])
+        file_chooser = FileChooserListView(path=os.path.expanduser("~"), filters=["*.ndjson", "*.jsonl", "*.json"])
         buttons = BoxLayout(size_hint_y=None, height=45, spacing=10)
         cancel_btn = Factory.CustomButton(text='Cancel', font_size=str(self.font_size) + 'sp', on_press=lambda x: popup.dismiss())
         load_btn = Factory.CustomButton(text='Load', font_size=str(self.font_size) + 'sp', on_press=lambda x: self.import_data(file_chooser.selection, popup))
@@ -123,14 +169,60 @@ class SettingsScreen(Screen):
 
     def import_data(self, selection, popup):
         try:
-            if selection:
-                with open(selection[0], "r") as f:
-                    self.app.app_data = json.load(f)
-                    self.app.save_data()
-                    self.theme = self.app.app_data.get("settings", {}).get("theme", "System Default")
-                    self.notifications = self.app.app_data.get("settings", {}).get("notifications", True)
-                    self.font_scale = self.app.app_data.get("settings", {}).get("font_scale", "Medium")
-                    self.apply_theme()
             popup.dismiss()
+            if selection:
+                self.start_import(selection[0])
         except Exception as e:
-            print(f"Error importing data: {e}")
\ No newline at end of file
+            print(f"Error importing data: {e}")
+
+    def start_import(self, path):
+        records = read_records(path)
+        merger = ProjectMerger(self.app.app_data.get("projects", []), self.app.history_store)
+        progress = Label(text="Importing... 0%", font_name="assets/fonts/seguiemj.ttf", font_size=str(self.font_size) + 'sp')
+        progress_popup = Popup(title='Import Data', content=progress, size_hint=(0.5, 0.3), auto_dismiss=False)
+        progress_popup.open()
+        # The whole import is one undo step, however many frames it spans
+        self.app.undo.begin()
+
+        def step(dt):
+            # Merge records until this frame's budget is spent, then yield to the UI
+            deadline = time.perf_counter() + IMPORT_FRAME_BUDGET
+            try:
+                # One journal record per frame rather than one per project
+                with self.app.transaction():
+                    for record, position, total in records:
+                        self.import_record(record, merger)
+                        if time.perf_counter() >= deadline:
+                            progress.text = f"Importing... {position * 100 // total}%"
+                            return True
+            except Exception as e:
+                print(f"Error importing data: {e}")
+            self.finish_import(merger, progress_popup)
+            return False
+
+        Clock.schedule_interval(step, 0)
+
+    def import_record(self, record, merger):
+        kind = record.get("type")
+        if kind == "project":
+            op, target, fields = merger.merge(record.get("project"))
+            if op == "add":
+                self.app.add_project(target)
+            elif op == "update":
+                old_data = target.copy()
+                target.update(fields)
+                self.app.history_store.record(target, old_data, target)
+                self.app.record_change("update", target=target, before=old_data, id=target["id"], fields=fields)
+        elif kind == "settings" and isinstance(record.get("settings"), dict):
+            before = dict(self.app.app_data.get("settings", {}))
+            self.app.app_data.setdefault("settings", {}).update(record["settings"])
+            self.app.record_change("settings", before=before, settings=self.app.app_data["settings"])
+
+    def finish_import(self, merger, progress_popup):
+        self.app.undo.end()
+        progress_popup.dismiss()
+        print(f"Imported {merger.added} new and {merger.updated} updated projects ({merger.skipped} unchanged or invalid)")
+        self.load_settings()
+        self.apply_theme()
+        if "project" in self.app.root.screen_names:
+            self.app.root.get_screen("project").update_project_list()
@@ -1,36 +1,59 @@
 from kivy.uix.screenmanager import Screen
 from kivy.properties import StringProperty, NumericProperty
 from kivy.app import App
-from datetime import datetime, timedelta
+from kivy.clock import Clock
+from kivy.graphics.texture import Texture
+from utils.charts import ChartRenderer, CHART_KINDS
 
 class StatsScreen(Screen):
     stats_summary = StringProperty("")
     font_size = NumericProperty(16)
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.chart_renderer = ChartRenderer()
+        self.chart_versions = {}
+
     def on_enter(self):
         try:
-            app = App.get_running_app()
-            projects = app.app_data.get("projects", [])
-            total_projects = len(projects)
-            completed = len([p for p in projects if p.get("status") == "Completed"])
-            last_week = datetime.now().date() - timedelta(days=7)
-            recent_projects = len([
-                p for p in projects 
-                if p.get("due_date") and datetime.strptime(p["due_date"], "%Y-%m-%d").date() >= last_week
-            ])
-            streaks = {}
-            for p in projects:
-                if p.get("recurrence", "None") != "None" and p.get("status") == "Completed":
-                    key = (p["name"], p["recurrence"])
-                    streaks[key] = streaks.get(key, 0) + 1
-            streak_text = "\n".join([f"{name} 📈 {count} {rec} streak" for (name, rec), count in streaks.items()]) or "No streaks yet 📉"
+            # Counters are maintained by the stats engine; nothing is rescanned here
+            stats = App.get_running_app().stats
+            figures = stats.summary()
+            streak_text = "\n".join([
+                f"{name} 📈 {current} {rec} streak (best {best})"
+                for name, rec, current, best in App.get_running_app().ledger.streaks() if best
+            ]) or "No streaks yet 📉"
             summary = (
-                f"Total Projects: {total_projects} 📋\n"
-                f"Completed: {completed} ✅\n"
-                f"Projects Due Last Week: {recent_projects} 📅\n"
+                f"Total Projects: {figures['total']} 📋\n"
+                f"Completed: {figures['completed']} ✅\n"
+                f"Projects Due Last Week: {figures['due_last_7_days']} 📅\n"
+                f"Due per Week (last 4): {' / '.join(str(n) for n in figures['due_per_week'])} 🗓️\n"
                 f"Streaks:\n{streak_text}"
             )
             self.stats_summary = summary
+            self.request_charts(stats)
         except Exception as e:
             print(f"Error loading stats: {e}")
-            self.stats_summary = "Error loading stats 😢"
\ No newline at end of file
+            self.stats_summary = "Error loading stats 😢"
+
+    def request_charts(self, stats):
+        # Plotting happens on the renderer's thread; unchanged data is never redrawn
+        if all(self.chart_versions.get(kind) == stats.version for kind in CHART_KINDS):
+            return
+        chart_data = stats.chart_data()
+        for kind in CHART_KINDS:
+            if self.chart_versions.get(kind) != stats.version:
+                self.chart_renderer.request(kind, stats.version, chart_data[kind], self.on_chart_ready)
+
+    def on_chart_ready(self, kind, version, width, height, rgba):
+        Clock.schedule_once(lambda dt: self.show_chart(kind, version, width, height, rgba), 0)
+
+    def show_chart(self, kind, version, width, height, rgba):
+        if self.chart_versions.get(kind, -1) > version:
+            return
+        # Upload the Agg buffer straight into a GPU texture; no image files involved
+        texture = Texture.create(size=(width, height), colorfmt='rgba')
+        texture.blit_buffer(rgba, colorfmt='rgba', bufferfmt='ubyte')
+        texture.flip_vertical()
+        self.ids[f"{kind}_chart"].texture = texture
+        self.chart_versions[kind] = version
\ No newline at end of file
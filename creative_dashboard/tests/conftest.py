@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+# Kivy must not parse pytest's arguments
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """The app keeps every file relative to its working directory; give each test its own."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def app(data_dir):
+    """A MainApp with its data layer set up as build() does, without opening any screen."""
+    kivy_app = pytest.importorskip("kivy.app")
+    main = pytest.importorskip("main")
+    from utils.history_store import HistoryStore
+    from utils.journal import Journal
+    from utils.project_index import ProjectIndex
+    from utils.recurrence import CompletionLedger
+    from utils.schema import DEFAULT_SETTINGS
+    from utils.stats_engine import StatsEngine
+    from utils.undo import UndoStack
+
+    app = main.MainApp()
+    app.app_data = {"projects": [], "settings": dict(DEFAULT_SETTINGS)}
+    app.journal = Journal()
+    app._batch = None
+    app.project_store = None
+    app.history_store = HistoryStore()
+    app.change_listeners = []
+    app.project_index = ProjectIndex(app.app_data["projects"])
+    app.bind_changes(app.project_index.on_change)
+    app.bind_changes(app.history_store.on_change)
+    app.stats = StatsEngine()
+    app.bind_changes(app.stats.on_change)
+    app.ledger = CompletionLedger()
+    app.bind_changes(app.ledger.on_change)
+    app.archive_cache = None
+    app.archive_set_aside = []
+    app.undo = UndoStack(app)
+    app.save_data = lambda: None
+    app._frame_event = app._overlay_event = app.profile_overlay = None
+    app._resize_trigger = lambda *args: None
+    kivy_app.App._running_app = app
+    yield app
+    kivy_app.App._running_app = None
@@ -0,0 +1,40 @@
+import json
+import os
+
+import pytest
+
+import cli
+
+LEGACY_DATA = {
+    "projects": [
+        {"name": "Garden", "category": "Personal", "due_date": "2026-05-01",
+         "history": [{"timestamp": "2026-01-01T10:00:00", "old": {"status": "Not Started"},
+                      "new": {"status": "In Progress"}}]},
+        "Taxes",
+    ],
+}
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def legacy_dir(request, data_dir, monkeypatch):
+    if request.param == "sqlite":
+        open_store = cli.open_project_store
+        monkeypatch.setattr(cli, "open_project_store", lambda: open_store("sqlite"))
+    with open("app_data.json", "w") as f:
+        json.dump(LEGACY_DATA, f)
+    return data_dir
+
+
+def list_json(capsys, directory):
+    assert cli.main(["--dir", str(directory), "list", "--json"]) == 0
+    out, err = capsys.readouterr()
+    return json.loads(out), err
+
+
+def test_migration_runs_once(capsys, legacy_dir):
+    first, err = list_json(capsys, legacy_dir)
+    second, _ = list_json(capsys, legacy_dir)
+    assert "Saving migrated data" in err
+    assert sorted(p["name"] for p in first) == ["Garden", "Taxes"]
+    assert [p["id"] for p in first] == [p["id"] for p in second]
+    assert len(os.listdir(legacy_dir / "history")) == 1
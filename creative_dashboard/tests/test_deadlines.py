@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.deadlines import DeadlineScheduler
+from utils.project_index import make_project
+
+NOW = datetime(2026, 1, 15, 14, 30)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = DeadlineScheduler(lambda project, days_left: None, lambda delay: None)
+    scheduler.last_check = NOW - timedelta(hours=1)
+    return scheduler
+
+
+def due_in(days, name="Project"):
+    return make_project(name, due_date=(NOW.date() + timedelta(days=days)).isoformat())
+
+
+def test_projects_added_during_the_day_get_their_crossed_threshold(scheduler):
+    today, soon, later = due_in(0, "Today"), due_in(2, "Soon"), due_in(5, "Later")
+    scheduler.rebuild([])
+    for project in (today, soon, later):
+        scheduler.schedule(project)
+    assert scheduler.run(now=NOW) == {today["id"]: 0, soon["id"]: 2, later["id"]: 5}
+
+
+def test_crossed_threshold_fires_once_per_due_date(scheduler):
+    project = due_in(2)
+    scheduler.rebuild([])
+    scheduler.schedule(project)
+    assert scheduler.run(now=NOW) == {project["id"]: 2}
+
+    project["name"] = "Renamed"
+    scheduler.schedule(project)
+    assert scheduler.run(now=NOW) == {}
+
+    project["due_date"] = (NOW.date() + timedelta(days=1)).isoformat()
+    scheduler.schedule(project)
+    assert scheduler.run(now=NOW) == {project["id"]: 1}
+
+
+def test_loaded_projects_do_not_repeat_crossed_thresholds(scheduler):
+    project = due_in(2)
+    scheduler.rebuild([project])
+    assert scheduler.run(now=NOW) == {}
+
+    scheduler.schedule(project)
+    scheduler.rebuild([project])
+    assert scheduler.run(now=NOW) == {}
+
+
+def test_past_due_projects_are_not_notified(scheduler):
+    scheduler.rebuild([])
+    scheduler.schedule(due_in(-1))
+    assert scheduler.run(now=NOW) == {}
@@ -0,0 +1,52 @@
+from utils.journal import Journal
+from utils.project_index import make_project
+from utils.sqlite_store import SQLiteStore
+
+
+def reopened(project):
+    """A completed project set back to In Progress, as save_project leaves it."""
+    edited = project.copy()
+    edited["status"] = "In Progress"
+    edited.pop("completed_on")
+    return edited
+
+
+def completed_project():
+    project = make_project("Taxes", due_date="2026-04-15")
+    project["status"] = "Completed"
+    project["completed_on"] = "2026-04-01"
+    return project
+
+
+def test_replace_drops_removed_keys_on_replay():
+    journal = Journal("app_data.journal")
+    project = completed_project()
+    journal.append({"op": "add", "project": project})
+    journal.append({"op": "update", "id": project["id"], "fields": reopened(project), "replace": True})
+    data = Journal(journal.path).replay({"projects": []})
+    [replayed] = data["projects"]
+    assert replayed["status"] == "In Progress"
+    assert "completed_on" not in replayed
+
+
+def test_update_without_replace_merges():
+    journal = Journal("app_data.journal")
+    project = completed_project()
+    journal.append({"op": "add", "project": project})
+    journal.append({"op": "update", "id": project["id"], "fields": {"name": "Tax return"}})
+    [replayed] = Journal(journal.path).replay({"projects": []})["projects"]
+    assert replayed["name"] == "Tax return"
+    assert replayed["completed_on"] == "2026-04-01"
+
+
+def test_sqlite_store_honours_replace():
+    store = SQLiteStore("app_data.db")
+    try:
+        project = completed_project()
+        store.apply({"op": "add", "project": project})
+        store.apply({"op": "update", "id": project["id"], "fields": reopened(project), "replace": True})
+        [stored] = store.load()["projects"]
+        assert "completed_on" not in stored
+        assert stored["status"] == "In Progress"
+    finally:
+        store.close()
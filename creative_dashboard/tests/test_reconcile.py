@@ -0,0 +1,43 @@
+import pytest
+
+from utils.reconcile import reconcile
+
+
+def make_rows(keys, selected=()):
+    return [{"project_id": key, "text": f"Project {key}", "selected": key in selected} for key in keys]
+
+
+CASES = [
+    ("reorder", list("abcdefgh"), list("hgfedcba"), ()),
+    ("select all", list("abcdefgh"), list("abcdefgh"), set("abcdefgh")),
+    ("edit one", list("abcdefgh"), list("abcdefgh"), {"d"}),
+    ("insert", list("abcdefgh"), list("abcXdefgh"), ()),
+    ("delete many", list("abcdefgh"), list("ah"), ()),
+    ("reset", list("abcdefgh"), [], ()),
+    ("restore", [], list("abcdefgh"), ()),
+]
+
+
+def check(rows, old_keys, new_keys, selected):
+    new_rows = make_rows(new_keys, selected)
+    reconcile(rows, new_rows)
+    assert list(rows) == new_rows
+
+
+@pytest.mark.parametrize("name, old_keys, new_keys, selected", CASES)
+def test_plain_list(name, old_keys, new_keys, selected):
+    check(make_rows(old_keys), old_keys, new_keys, selected)
+
+
+@pytest.mark.parametrize("name, old_keys, new_keys, selected", CASES)
+def test_recycleview_data(name, old_keys, new_keys, selected):
+    recycleview = pytest.importorskip("kivy.uix.recycleview")
+    view = recycleview.RecycleView()
+    view.data = make_rows(old_keys)
+    check(view.data, old_keys, new_keys, selected)
+
+
+def test_unchanged_rows_are_not_written():
+    rows = make_rows("abcdefgh")
+    assert reconcile(rows, make_rows("abcdefgh", {"c"})) == 1
+    assert reconcile(rows, make_rows("abcdefgh", {"c"})) == 0
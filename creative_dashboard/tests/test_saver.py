@@ -0,0 +1,66 @@
+import threading
+import time
+
+from utils.saver import BackgroundSaver
+
+
+def test_close_writes_the_last_snapshot():
+    written = []
+    saver = BackgroundSaver(written.append)
+    saver.submit(1)
+    saver.submit(2)
+    assert saver.close() is True
+    assert written[-1] == 2
+
+
+def test_submit_after_close_is_ignored():
+    written = []
+    saver = BackgroundSaver(written.append)
+    saver.close()
+    assert saver.submit(3) is False
+    assert saver.flush(timeout=1) is True
+    assert saver.close(timeout=1) is True
+    assert written == []
+
+
+def test_flush_returns_when_worker_is_gone():
+    saver = BackgroundSaver(lambda snapshot: None)
+    saver.close()
+    # Queued behind the closed flag, as a second on_stop used to
+    saver.pending = "late"
+    done = threading.Event()
+    threading.Thread(target=lambda: (saver.flush(), done.set()), daemon=True).start()
+    assert done.wait(2)
+    assert saver.flush() is False
+
+
+def test_close_times_out_on_a_stuck_write():
+    release = threading.Event()
+    saver = BackgroundSaver(lambda snapshot: release.wait(5))
+    saver.submit(1)
+    start = time.perf_counter()
+    assert saver.close(timeout=0.2) is False
+    assert time.perf_counter() - start < 2
+    release.set()
+
+
+def test_snapshot_is_serialized_outside_the_data_lock(monkeypatch):
+    import json
+
+    from utils.filelock import DATA_LOCK
+    from utils.journal import Journal
+    from utils.loader import data_stamp, load_app_data, snapshot_data, write_snapshot
+
+    journal = Journal()
+    data, _ = load_app_data(journal, None)
+    snapshot = snapshot_data(data, 0)
+    dumps = json.dumps
+    held = []
+
+    def checked_dumps(obj, *args, **kwargs):
+        if obj is snapshot:
+            held.append(DATA_LOCK.depth)
+        return dumps(obj, *args, **kwargs)
+    monkeypatch.setattr(json, "dumps", checked_dumps)
+    assert write_snapshot(snapshot, journal, data_stamp(), fsync=False) is not None
+    assert held == [0]
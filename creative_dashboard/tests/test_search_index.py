@@ -0,0 +1,68 @@
+import queue
+
+import pytest
+
+from utils.project_index import make_project
+from utils.queries import filter_projects
+from utils.search_index import SearchIndex
+
+
+@pytest.fixture
+def posted():
+    return queue.Queue()
+
+
+@pytest.fixture
+def index(posted):
+    return SearchIndex(post=posted.put)
+
+
+def run_posted(posted):
+    posted.get(timeout=10)()
+
+
+def names(projects):
+    return [p["name"] for p in projects]
+
+
+def test_searches_scan_until_the_worker_is_done(index, posted):
+    projects = [make_project(name) for name in ("Paint fence", "Plan garden", "Garden party")]
+    assert index.ensure_built(projects) is False
+    assert names(filter_projects(projects, search_text="garden", sort_by="Relevance", search_index=index)) == \
+        ["Plan garden", "Garden party"]
+
+    ready = []
+    index.on_ready = lambda: ready.append(True)
+    run_posted(posted)
+    assert index.built and ready == [True]
+    assert names(filter_projects(projects, search_text="garden", sort_by="Relevance", search_index=index)) == \
+        ["Garden party", "Plan garden"]
+
+
+def test_changes_made_while_building_are_applied(index, posted):
+    projects = [make_project(name) for name in ("Paint fence", "Plan garden")]
+    index.ensure_built(projects)
+    added = make_project("Garden shed")
+    projects.append(added)
+    index.on_change("add", added, {"projects": projects})
+    projects[0]["name"] = "Paint garden fence"
+    index.on_change("update", projects[0], {"projects": projects})
+    index.on_change("delete", projects.pop(1), {"projects": projects})
+
+    run_posted(posted)
+    assert names(index.search("garden")) == ["Paint garden fence", "Garden shed"]
+
+
+def test_reload_rebuilds_off_the_ui_thread_and_drops_stale_builds(index, posted):
+    projects = [make_project("Plan garden")]
+    index.ensure_built(projects)
+    run_posted(posted)
+
+    data = {"projects": [make_project("Garden shed")]}
+    index.on_change("reset", None, {"projects": []})
+    index.on_change("reload", None, data)
+    assert not index.built
+    run_posted(posted)
+    run_posted(posted)
+    assert index.built
+    assert names(index.search("garden")) == ["Garden shed"]
@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+from utils.data_manager import DATA_FILE, archive_projects, archived_count, archived_day_counts, save_data
+from utils.project_index import make_project
+from utils.stats_engine import StatsEngine
+
+TODAY = date(2026, 1, 14)  # A Wednesday; five days earlier is last week
+
+
+def completed_project(days_ago):
+    day = (TODAY - timedelta(days=days_ago)).isoformat()
+    project = make_project(f"Done {days_ago} days ago", due_date=day)
+    project["status"] = "Completed"
+    project["completed_on"] = day
+    return project
+
+
+def figures(stats):
+    return stats.summary(TODAY), stats.chart_data(today=TODAY)["completion"]
+
+
+def test_archiving_keeps_due_and_completion_figures():
+    projects = [completed_project(5), completed_project(12), make_project("Open")]
+    stats = StatsEngine()
+    stats.rebuild(projects)
+    before = figures(stats)
+
+    hot, archived = archive_projects(projects, TODAY)
+    assert archived == 2
+    stats = StatsEngine()
+    stats.set_archived(archived_count(), *archived_day_counts())
+    stats.rebuild(hot)
+    assert figures(stats) == before
+    assert before[0]["due_last_7_days"] == 1
+
+
+def test_manifests_without_day_counts_are_backfilled():
+    archive_projects([completed_project(5)], TODAY)
+    manifest = {"current_week": "2026-W03", "archives": {"2026-W02": 1}}
+    save_data(manifest, DATA_FILE)
+
+    archive_projects([], TODAY)
+    due, completed = archived_day_counts()
+    day = (TODAY - timedelta(days=5)).toordinal()
+    assert (due, completed) == ({day: 1}, {day: 1})
+
+
+def test_archiving_the_same_projects_again_adds_no_repeats():
+    projects = [completed_project(5), completed_project(6)]
+    archive_projects(projects, TODAY)
+    archive_projects(projects, TODAY)
+    assert archived_count() == 2
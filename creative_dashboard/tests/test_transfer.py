@@ -0,0 +1,53 @@
+import json
+
+from utils.history_store import HistoryStore
+from utils.transfer import ProjectMerger, read_records
+
+LEGACY_EXPORT = {
+    "projects": [{
+        "name": "Paint fence",
+        "category": "Personal",
+        "status": "In Progress",
+        "due_date": "2026-02-01",
+        "history": [
+            {"timestamp": "2025-12-01T10:00:00", "old": {"status": "Not Started"}, "new": {"status": "In Progress"}},
+        ],
+    }],
+}
+
+
+def import_file(path, projects, history_store):
+    merger = ProjectMerger(projects, history_store)
+    for record, _, _ in read_records(path):
+        op, target, _ = merger.merge(record.get("project"))
+        if op == "add":
+            projects.append(target)
+        elif op == "update":
+            target.update(record["project"])
+    return merger
+
+
+def test_legacy_export_keeps_inline_history(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(LEGACY_EXPORT))
+    history_store = HistoryStore()
+    projects = []
+    import_file(str(path), projects, history_store)
+
+    assert "history" not in projects[0]
+    assert history_store.load_project(projects[0]) == [
+        {"timestamp": "2025-12-01T10:00:00", "changes": {"status": ["Not Started", "In Progress"]}},
+    ]
+
+
+def test_reimporting_changed_projects_does_not_repeat_history(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(LEGACY_EXPORT))
+    history_store = HistoryStore()
+    projects = []
+    import_file(str(path), projects, history_store)
+    projects[0]["status"] = "Completed"
+
+    merger = import_file(str(path), projects, history_store)
+    assert merger.updated == 1
+    assert len(history_store.load_project(projects[0])) == 1
@@ -0,0 +1,240 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def settings_screen(app):
+    from kivy.lang import Builder
+    from kivy.uix.screenmanager import ScreenManager
+
+    import main
+    from screens.settings import SettingsScreen
+
+    Builder.load_file(os.path.join(main.KV_DIR, "settings.kv"))
+    screen = SettingsScreen(name="settings")
+    app.root = ScreenManager()
+    app.root.add_widget(screen)
+    yield screen
+    Builder.unload_file(os.path.join(main.KV_DIR, "settings.kv"))
+
+
+def test_building_the_screen_records_nothing(app, settings_screen):
+    assert not app.undo.undo_steps
+
+
+def test_settings_toggle_undo_then_redo(app, settings_screen):
+    # Same path as a click: the checkbox's on_active saves
+    settings_screen.notifications = False
+    assert len(app.undo.undo_steps) == 1
+
+    app.undo_change()
+    assert app.app_data["settings"]["notifications"] is True
+    assert settings_screen.notifications is True
+    assert (len(app.undo.undo_steps), len(app.undo.redo_steps)) == (0, 1)
+
+    app.redo_change()
+    assert app.app_data["settings"]["notifications"] is False
+    assert (len(app.undo.undo_steps), len(app.undo.redo_steps)) == (1, 0)
+
+
+def test_unchanged_settings_are_not_recorded(app, settings_screen):
+    settings_screen.save_settings()
+    assert not app.undo.undo_steps
+
+
+@pytest.fixture
+def projects(app):
+    from utils.project_index import make_project
+
+    added = []
+    for name in ("Paint", "Write", "Plan"):
+        project = make_project(name)
+        app.add_project(project)
+        app.history_store.record(project, {"status": "Not Started"}, {"status": "In Progress"})
+        added.append(project)
+    app.undo.clear()
+    return added
+
+
+def history_lengths(app, projects):
+    return [len(app.history_store.load_project(p)) for p in projects]
+
+
+def test_undoing_a_delete_brings_its_history_back(app, projects):
+    app.delete_project(projects[0]["id"])
+    assert history_lengths(app, projects) == [0, 1, 1]
+
+    app.undo_change()
+    assert history_lengths(app, projects) == [1, 1, 1]
+
+    app.redo_change()
+    assert history_lengths(app, projects) == [0, 1, 1]
+
+
+def test_undoing_a_bulk_delete_brings_the_histories_back(app, projects):
+    app.delete_projects([p["id"] for p in projects[:2]])
+    assert history_lengths(app, projects) == [0, 0, 1]
+
+    app.undo_change()
+    assert history_lengths(app, projects) == [1, 1, 1]
+
+
+def test_undoing_a_reset_brings_the_histories_back(app, projects):
+    app.reset_projects()
+    assert history_lengths(app, projects) == [0, 0, 0]
+
+    app.undo_change()
+    assert history_lengths(app, projects) == [1, 1, 1]
+
+
+def test_purge_removes_what_can_no_longer_be_undone(app, projects, data_dir):
+    app.delete_project(projects[0]["id"])
+    app.purge_set_aside()
+    app.undo_change()
+    assert history_lengths(app, projects) == [0, 1, 1]
+    assert sorted(os.listdir(data_dir / "history")) == sorted(f"{p['id']}.jsonl" for p in projects[1:])
+
+
+@pytest.fixture
+def archive_and_ledger(app):
+    from datetime import date
+
+    from utils.data_manager import archive_projects
+    from utils.project_index import make_project
+
+    old = make_project("Done last year", due_date="2025-01-06")
+    old["status"] = "Completed"
+    archive_projects([old], date(2026, 1, 14))
+    app.ledger.record("series", "Daily walk", "Daily", date(2026, 1, 13))
+    app.add_project(make_project("Open"))
+    app.undo.clear()
+
+
+def archive_and_streaks(app):
+    from utils.data_manager import archived_count
+
+    return archived_count(), app.stats.archived, [s[0] for s in app.ledger.streaks()]
+
+
+def test_undoing_a_reset_brings_the_archive_and_ledger_back(app, archive_and_ledger):
+    app.stats.archived = 1
+    app.reset_projects()
+    assert archive_and_streaks(app) == (0, 0, [])
+
+    app.undo_change()
+    assert archive_and_streaks(app) == (1, 1, ["Daily walk"])
+    assert len(app.app_data["projects"]) == 1
+
+    app.redo_change()
+    assert archive_and_streaks(app) == (0, 0, [])
+
+
+def test_purging_after_a_reset_removes_what_was_set_aside(app, archive_and_ledger, data_dir):
+    app.reset_projects()
+    app.purge_set_aside()
+    assert not (data_dir / "data" / "archive.deleted").exists()
+    assert not [name for name in os.listdir(data_dir) if name.endswith(".deleted")]
+
+
+@pytest.fixture
+def project_screen(app):
+    from kivy.lang import Builder
+    from kivy.uix.screenmanager import ScreenManager
+
+    import main
+    from screens.project import ProjectScreen
+
+    Builder.load_file(os.path.join(main.KV_DIR, "project.kv"))
+    screen = ProjectScreen(name="project")
+    app.root = ScreenManager()
+    app.root.add_widget(screen)
+    yield screen
+    Builder.unload_file(os.path.join(main.KV_DIR, "project.kv"))
+
+
+class Popup:
+    def dismiss(self):
+        pass
+
+
+def streaks(app):
+    return [(name, best) for name, _, _, best in app.ledger.streaks()]
+
+
+def test_undoing_a_completed_occurrence_takes_back_its_streak(app, project_screen):
+    from utils.project_index import make_project
+
+    project = make_project("Daily walk", due_date="2026-01-13", recurrence="Daily")
+    app.add_project(project)
+    app.undo.clear()
+    project_screen.save_project(project["id"], "Daily walk", "General", "2026-01-13", "Daily", "Completed", Popup())
+    assert streaks(app) == [("Daily walk", 1)]
+    assert project["status"] == "Not Started"
+    assert len(app.undo.undo_steps) == 1
+
+    app.undo_change()
+    assert streaks(app) == [("Daily walk", 0)]
+    assert project["due_date"] == "2026-01-13"
+
+    app.redo_change()
+    assert streaks(app) == [("Daily walk", 1)]
+
+    # Also after reading the ledger file again
+    from utils.recurrence import CompletionLedger
+    assert [s[3] for s in CompletionLedger().streaks()] == [1]
+    app.undo_change()
+    assert [s[3] for s in CompletionLedger().streaks()] == [0]
+
+
+def test_deleted_projects_leave_the_streaks_until_undone(app):
+    from datetime import date
+
+    from utils.project_index import make_project
+    from utils.recurrence import CompletionLedger
+
+    project = make_project("Daily walk", recurrence="Daily")
+    app.add_project(project)
+    app.ledger.record(project["id"], project["name"], "Daily", date(2026, 1, 13))
+    app.delete_project(project["id"])
+    assert streaks(app) == []
+    assert CompletionLedger().streaks() == []
+
+    app.undo_change()
+    assert streaks(app) == [("Daily walk", 1)]
+    assert [s[0] for s in CompletionLedger().streaks()] == ["Daily walk"]
+
+
+class Progress:
+    def __init__(self, **kwargs):
+        self.text = kwargs.get("text", "")
+
+    def open(self):
+        pass
+
+    def dismiss(self):
+        pass
+
+
+def test_an_import_frame_is_one_journal_record(app, settings_screen, data_dir, monkeypatch):
+    import json
+
+    import screens.settings
+    # Frames are run by hand: drawing needs fonts that are not part of the repository
+    frames = []
+    monkeypatch.setattr(screens.settings.Clock, "schedule_interval", lambda step, interval: frames.append(step))
+    monkeypatch.setattr(screens.settings, "Label", Progress)
+    monkeypatch.setattr(screens.settings, "Popup", Progress)
+    path = data_dir / "export.ndjson"
+    path.write_text("".join(json.dumps({"type": "project", "project": {"name": f"Imported {n}"}}) + "\n"
+                            for n in range(50)))
+    settings_screen.start_import(str(path))
+    while frames[0](0):
+        pass
+
+    assert len(app.app_data["projects"]) == 50
+    with open(app.journal.path) as f:
+        records = [json.loads(line) for line in f]
+    assert [r["op"] for r in records] == ["batch"]
+    assert len(records[0]["records"]) == 50
+    assert len(app.undo.undo_steps) == 1
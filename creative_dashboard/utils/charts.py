@@ -0,0 +1,88 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+CHART_SIZE = (640, 400)  # Pixels
+CHART_DPI = 100
+CHART_KINDS = ("burndown", "completion", "category")
+
+
+def render_chart(kind, series, size=CHART_SIZE):
+    """Draw one chart with the Agg backend; returns ``(width, height, rgba_bytes)``.
+
+    matplotlib is imported here, on the worker thread, and pyplot is never
+    touched, so no GUI backend or global figure state is involved.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(size[0] / CHART_DPI, size[1] / CHART_DPI), dpi=CHART_DPI)
+    canvas = FigureCanvasAgg(figure)
+    axes = figure.add_subplot(1, 1, 1)
+    if kind == "burndown":
+        start, values = series
+        axes.plot(range(len(values)), values, color="#3399ff")
+        axes.set_title("Open projects (burndown)")
+        axes.set_xlabel(f"Days from {date.fromordinal(start).isoformat()}")
+    elif kind == "completion":
+        start, values = series
+        axes.bar(range(len(values)), values, color="#33cc99")
+        axes.set_title("Completed per day")
+        axes.set_xlabel(f"Days since {date.fromordinal(start).isoformat()}")
+    elif kind == "category":
+        labels = [label for label, _ in series] or ["None"]
+        counts = [count for _, count in series] or [0]
+        axes.bar(labels, counts, color="#ff9933")
+        axes.set_title("Projects per category")
+    figure.tight_layout()
+    canvas.draw()
+    width, height = canvas.get_width_height()
+    return width, height, bytes(canvas.buffer_rgba())
+
+
+class ChartRenderer:
+    """Renders charts on one background thread and caches the pixel buffers.
+
+    Results are keyed by ``(kind, data_version)``; asking again for a key
+    that is cached or already rendering does no work.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="charts")
+        self.lock = threading.Lock()
+        self.cache = {}
+        self.in_flight = set()
+
+    def request(self, kind, version, series, on_ready):
+        """Call ``on_ready(kind, version, width, height, rgba)`` from the worker thread."""
+        key = (kind, version)
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is None and key in self.in_flight:
+                return
+            if cached is None:
+                self.in_flight.add(key)
+        if cached is not None:
+            on_ready(kind, version, *cached)
+            return
+        self.executor.submit(self._render, key, series, on_ready)
+
+    def _render(self, key, series, on_ready):
+        kind, version = key
+        try:
+            result = render_chart(kind, series)
+        except Exception as e:
+            print(f"Error rendering {kind} chart: {e}")
+            with self.lock:
+                self.in_flight.discard(key)
+            return
+        with self.lock:
+            self.in_flight.discard(key)
+            # Older versions of the same chart can never be shown again
+            for old_key in [k for k in self.cache if k[0] == kind]:
+                del self.cache[old_key]
+            self.cache[key] = result
+        on_ready(kind, version, *result)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,17 +1,26 @@
 import json
 import os
+import shutil
+import uuid
+from collections import Counter
+from datetime import date
+
+from utils.project_record import date_ordinal, json_default
 
 DATA_FILE = "data/data.json"
+ARCHIVE_DIR = "data/archive"
+ARCHIVE_TRASH = "data/archive.deleted"  # What each reset set aside, until it can't be undone
+UNDATED_WEEK = "undated"
 
-def load_data():
-    if not os.path.exists(DATA_FILE):
+def load_data(path=DATA_FILE):
+    if not os.path.exists(path):
         return {
             "projects": [],
             "rewards": [],
             "current_week": 1
         }
 
-    with open(DATA_FILE, "r") as f:
+    with open(path, "r") as f:
         try:
             return json.load(f)
         except json.JSONDecodeError:
@@ -21,7 +30,155 @@ def load_data():
                 "current_week": 1
             }
 
-def save_data(data):
-    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+def save_data(data, path=DATA_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=4, default=json_default)
+    os.replace(tmp_path, path)
+
+def week_key(day):
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def project_week(project):
+    """ISO week a completed project belongs to: its due date, else its completion date."""
+    for field in ("due_date", "completed_on"):
+        value = project.get(field, "")
+        try:
+            return week_key(date.fromisoformat(value))
+        except (TypeError, ValueError):
+            continue
+    return UNDATED_WEEK
+
+def archive_path(week):
+    return os.path.join(ARCHIVE_DIR, f"{week}.json")
+
+def load_week(week):
+    return load_data(archive_path(week)).get("projects", [])
+
+def archived_weeks():
+    return load_data().get("archives", {})
+
+def archived_count():
+    return sum(archived_weeks().values())
+
+def week_day_counts(projects):
+    """How many of ``projects`` fall due and were completed on each day, as the manifest keeps it."""
+    due = Counter()
+    completed = Counter()
+    for project in projects:
+        for counter, field in ((due, "due_date"), (completed, "completed_on")):
+            day = date_ordinal(project.get(field, ""))
+            if day is not None:
+                counter[str(day)] += 1
+    return {"due": dict(due), "completed": dict(completed)}
+
+def archived_day_counts():
+    """Archived projects per due day and per completion day, as two Counters keyed by day ordinal."""
+    due = Counter()
+    completed = Counter()
+    for counts in load_data().get("archive_days", {}).values():
+        for counter, field in ((due, "due"), (completed, "completed")):
+            for day, count in counts.get(field, {}).items():
+                counter[int(day)] += count
+    return due, completed
+
+def archive_projects(projects, today=None):
+    """Move completed projects from past weeks into per-week archive files.
+
+    Returns the projects that stay in the hot working set and how many
+    were archived. Only the touched week files and the manifest in
+    DATA_FILE are rewritten.
+    """
+    current = week_key(today or date.today())
+    hot = []
+    cold = {}
+    for project in projects:
+        if project.get("status") == "Completed":
+            week = project_week(project)
+            if week == UNDATED_WEEK or week < current:
+                cold.setdefault(week, []).append(project)
+                continue
+        hot.append(project)
+    manifest = load_data()
+    rolled = manifest.get("current_week") != current
+    manifest["current_week"] = current
+    archives = manifest.setdefault("archives", {})
+    day_counts = manifest.setdefault("archive_days", {})
+    backfilled = False
+    for week in archives:
+        if week not in day_counts and week not in cold:
+            # Archived before the manifest kept day counts
+            day_counts[week] = week_day_counts(load_week(week))
+            backfilled = True
+    for week, moved in cold.items():
+        shard = load_data(archive_path(week))
+        archived = shard.get("projects", [])
+        # A crash after this write but before the hot snapshot is saved would
+        # archive the same projects again next time; skip repeats by ID
+        seen = {p.get("id") for p in archived}
+        archived += [p for p in moved if p["id"] not in seen]
+        shard["projects"] = archived
+        save_data(shard, archive_path(week))
+        archives[week] = len(archived)
+        day_counts[week] = week_day_counts(archived)
+    if cold or rolled or backfilled:
+        save_data(manifest)
+    return hot, sum(len(moved) for moved in cold.values())
+
+def clear_archive():
+    """Set the archive aside; returns the key restore_archive() takes, or None if there was none."""
+    manifest = load_data()
+    entries = {field: manifest.pop(field) for field in ("archives", "archive_days") if field in manifest}
+    if not entries and not os.path.isdir(ARCHIVE_DIR):
+        return None
+    key = uuid.uuid4().hex
+    trash = os.path.join(ARCHIVE_TRASH, key)
+    os.makedirs(trash)
+    if os.path.isdir(ARCHIVE_DIR):
+        os.replace(ARCHIVE_DIR, os.path.join(trash, "archive"))
+    save_data(entries, os.path.join(trash, "manifest.json"))
+    if entries:
+        save_data(manifest)
+    return key
+
+def restore_archive(key):
+    """Put back what clear_archive() set aside, merged with any week archived since."""
+    trash = os.path.join(ARCHIVE_TRASH, key)
+    saved = load_data(os.path.join(trash, "manifest.json"))
+    saved_days = saved.get("archive_days", {})
+    manifest = load_data()
+    archives = manifest.setdefault("archives", {})
+    day_counts = manifest.setdefault("archive_days", {})
+    old_dir = os.path.join(trash, "archive")
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    for name in os.listdir(old_dir) if os.path.isdir(old_dir) else []:
+        if not name.endswith(".json"):
+            continue
+        week = name[:-len(".json")]
+        if week in archives:
+            # Archived again since, e.g. by another instance starting up
+            archived = load_week(week)
+            seen = {p.get("id") for p in archived}
+            archived += [p for p in load_data(os.path.join(old_dir, name))["projects"] if p.get("id") not in seen]
+            save_data({"projects": archived}, archive_path(week))
+        else:
+            os.replace(os.path.join(old_dir, name), archive_path(week))
+            if week in saved_days:
+                archives[week] = saved["archives"][week]
+                day_counts[week] = saved_days[week]
+                continue
+            archived = load_week(week)
+        archives[week] = len(archived)
+        day_counts[week] = week_day_counts(archived)
+    save_data(manifest)
+    purge_archive(key)
+
+def purge_archive(key):
+    shutil.rmtree(os.path.join(ARCHIVE_TRASH, key), ignore_errors=True)
+    try:
+        os.rmdir(ARCHIVE_TRASH)
+    except OSError:
+        # Other resets are still set aside
+        pass
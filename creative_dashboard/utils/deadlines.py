@@ -0,0 +1,161 @@
+import heapq
+import json
+from datetime import datetime, timedelta
+
+THRESHOLDS = (7, 2, 0)  # Days before the due date that get a notification
+STATE_FILE = "deadlines.json"
+
+
+def notification_message(project, days_left):
+    due_date = project.get("due_date", "")
+    if days_left == 0:
+        return f"'{project['name']}' is due today ({due_date})"
+    if days_left == 7:
+        return f"'{project['name']}' is due in 1 week ({due_date})"
+    return f"'{project['name']}' is due in {days_left} days ({due_date})"
+
+
+class DeadlineScheduler:
+    """Min-heap of upcoming notification instants.
+
+    Each project contributes one entry per threshold. Changes push fresh
+    entries and bump the project's version so older entries are skipped
+    when they surface, which keeps every change at O(log n). Only the
+    earliest instant is ever armed through ``arm(delay_seconds)``.
+
+    A project added or moved during the day may already be past a
+    threshold; it still gets the nearest one it crossed, once per due date.
+    """
+
+    def __init__(self, notify, arm, thresholds=THRESHOLDS, state_path=STATE_FILE):
+        self.notify = notify
+        self.arm = arm
+        self.thresholds = thresholds
+        self.state_path = state_path
+        self.heap = []
+        self.versions = {}
+        self.projects = {}
+        self.notified = {}  # Project ID -> (due ordinal, nearest threshold covered)
+        self.armed_at = None
+        self.last_check = self._load_last_check()
+
+    def _load_last_check(self):
+        try:
+            with open(self.state_path, "r") as f:
+                return datetime.fromisoformat(json.load(f)["last_check"])
+        except (OSError, ValueError, KeyError):
+            # First run: only today's thresholds are still pending
+            return datetime.combine(datetime.now().date(), datetime.min.time()) - timedelta(microseconds=1)
+
+    def _save_last_check(self):
+        try:
+            with open(self.state_path, "w") as f:
+                json.dump({"last_check": self.last_check.isoformat()}, f)
+        except OSError as e:
+            print(f"Error saving deadline state: {e}")
+
+    def rebuild(self, projects):
+        self.heap = []
+        self.versions.clear()
+        self.projects.clear()
+        for project in projects:
+            self._push(project)
+        heapq.heapify(self.heap)
+        self._rearm()
+
+    def _push(self, project, heap_push=None, catch_up=False):
+        key = project["id"]
+        version = self.versions.get(key, 0) + 1
+        self.versions[key] = version
+        self.projects[key] = project
+        if project.due_ordinal is None:
+            if project.get("due_date"):
+                print(f"Invalid due date for '{project.get('name')}': {project['due_date']}")
+            return
+        due_date = datetime.fromordinal(project.due_ordinal)
+        crossed = None
+        for days_left in self.thresholds:
+            instant = due_date - timedelta(days=days_left)
+            if instant > self.last_check:
+                self._add_entry((instant, days_left, key, version), heap_push)
+            elif crossed is None or days_left < crossed:
+                crossed = days_left
+        if crossed is None or due_date.date() < self.last_check.date():
+            return
+        notified = self.notified.get(key)
+        if notified and notified[0] == project.due_ordinal and notified[1] <= crossed:
+            return
+        if catch_up:
+            # Past instant: fires on the next run, with the real days left
+            self._add_entry((due_date - timedelta(days=crossed), crossed, key, version), heap_push)
+        else:
+            # Loaded as it was: the run that passed this threshold covered it
+            self.notified[key] = (project.due_ordinal, crossed)
+
+    def _add_entry(self, entry, heap_push):
+        if heap_push:
+            heap_push(self.heap, entry)
+        else:
+            self.heap.append(entry)
+
+    def schedule(self, project):
+        self._push(project, heapq.heappush, catch_up=True)
+        self._prune()
+        self._rearm()
+
+    def unschedule(self, project):
+        key = project["id"]
+        self.versions[key] = self.versions.get(key, 0) + 1
+        self.projects.pop(key, None)
+        self._prune()
+        self._rearm()
+
+    def _prune(self):
+        if len(self.heap) > 4 * len(self.thresholds) * (len(self.projects) + 1):
+            # Mostly stale entries left; drop them in one pass
+            self.heap = [e for e in self.heap if self.versions.get(e[2]) == e[3]]
+            heapq.heapify(self.heap)
+
+    def on_change(self, op, project, app_data):
+        if op in ("add", "update"):
+            self.schedule(project)
+        elif op == "delete":
+            self.unschedule(project)
+        elif op in ("reset", "reload"):
+            self.rebuild(app_data.get("projects", []))
+
+    def _rearm(self):
+        while self.heap and self.versions.get(self.heap[0][2]) != self.heap[0][3]:
+            heapq.heappop(self.heap)
+        head = self.heap[0][0] if self.heap else None
+        if head == self.armed_at:
+            return
+        self.armed_at = head
+        if head is not None:
+            self.arm(max((head - datetime.now()).total_seconds(), 0))
+
+    def run(self, enabled=True, now=None):
+        """Fire every instant that has passed, including ones missed while closed."""
+        now = now or datetime.now()
+        due = {}
+        while self.heap and self.heap[0][0] <= now:
+            instant, days_left, key, version = heapq.heappop(self.heap)
+            if self.versions.get(key) != version:
+                continue
+            due_ordinal = self.projects[key].due_ordinal
+            notified = self.notified.get(key)
+            if not notified or notified[0] != due_ordinal or days_left < notified[1]:
+                self.notified[key] = (due_ordinal, days_left)
+            # Several thresholds can be missed during downtime; one message
+            # with the real distance to the due date covers all of them
+            days_left = (instant.date() + timedelta(days=days_left) - now.date()).days
+            if days_left >= 0:
+                due[key] = days_left
+        if enabled:
+            for key, days_left in due.items():
+                self.notify(self.projects[key], days_left)
+        self.last_check = now
+        self._save_last_check()
+        self.armed_at = None
+        self._rearm()
+        return due
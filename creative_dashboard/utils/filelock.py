@@ -0,0 +1,71 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_FILE = "app_data.lock"
+
+
+class FileLock:
+    """Advisory lock on the data directory, shared by every process using it.
+
+    Re-entrant within a thread and exclusive between threads, so code
+    holding it can call helpers that take it again.
+    """
+
+    def __init__(self, path=LOCK_FILE):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.fd = None
+
+    def __enter__(self):
+        self.thread_lock.acquire()
+        if self.depth == 0:
+            try:
+                self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+                self._lock(self.fd)
+            except Exception:
+                if self.fd is not None:
+                    os.close(self.fd)
+                    self.fd = None
+                self.thread_lock.release()
+                raise
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self.depth -= 1
+        if self.depth == 0:
+            self._unlock(self.fd)
+            os.close(self.fd)
+            self.fd = None
+        self.thread_lock.release()
+
+    @staticmethod
+    def _lock(fd):
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            return
+        while True:
+            try:
+                # LK_LOCK gives up after ~10 seconds; keep waiting
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    @staticmethod
+    def _unlock(fd):
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+DATA_LOCK = FileLock()
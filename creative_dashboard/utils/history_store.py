@@ -0,0 +1,168 @@
+import json
+import os
+from datetime import datetime
+
+from utils.project_index import new_project_id
+
+HISTORY_DIR = "history"
+HISTORY_LIMIT = 50  # Entries kept per project once a file is compacted
+TRASH_DIR = "deleted"  # Under the history directory; see drop()
+
+
+def diff_fields(old, new):
+    changes = {}
+    for field in set(old) | set(new):
+        if field == "history":
+            continue
+        if old.get(field) != new.get(field):
+            changes[field] = [old.get(field), new.get(field)]
+    return changes
+
+
+class HistoryStore:
+    """Field-level change history, one append-only file per project.
+
+    Nothing is read at startup; a project's file is only opened when its
+    history is requested. Files are compacted down to ``limit`` entries
+    once they grow to twice that size.
+
+    Deleting a project moves its file aside rather than removing it, so
+    undoing the delete brings the history back; purge() removes what is
+    left aside once the deletes can no longer be undone.
+    """
+
+    def __init__(self, path=HISTORY_DIR, limit=HISTORY_LIMIT):
+        self.path = path
+        self.limit = limit
+        self.counts = {}
+        self.dropped = set()  # Keys this instance moved aside
+
+    def key_for(self, project):
+        if not project.get("id"):
+            project["id"] = new_project_id()
+        return project["id"]
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.jsonl")
+
+    def _trash_file(self, key):
+        return os.path.join(self.path, TRASH_DIR, f"{key}.jsonl")
+
+    def record(self, project, old, new, timestamp=None):
+        changes = diff_fields(old, new)
+        if not changes:
+            return
+        self.append(self.key_for(project), {
+            "timestamp": timestamp or datetime.now().isoformat(),
+            "changes": changes
+        })
+
+    def append(self, key, entry):
+        os.makedirs(self.path, exist_ok=True)
+        with open(self._file(key), "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        if key not in self.counts:
+            self.counts[key] = len(self.load(key))
+        else:
+            self.counts[key] += 1
+        if self.limit and self.counts[key] >= self.limit * 2:
+            self.compact(key)
+
+    def load(self, key):
+        try:
+            with open(self._file(key), "r") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+        except ValueError as e:
+            print(f"Error reading history for {key}: {e}")
+            return []
+
+    def load_project(self, project):
+        return self.load(project["id"]) if project.get("id") else []
+
+    def compact(self, key):
+        entries = self.load(key)[-self.limit:]
+        tmp_file = self._file(key) + ".tmp"
+        with open(tmp_file, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_file, self._file(key))
+        self.counts[key] = len(entries)
+
+    def drop(self, project):
+        if project.get("id"):
+            self._set_aside(project["id"])
+
+    def _set_aside(self, key):
+        self.counts.pop(key, None)
+        os.makedirs(os.path.join(self.path, TRASH_DIR), exist_ok=True)
+        try:
+            os.replace(self._file(key), self._trash_file(key))
+        except FileNotFoundError:
+            return
+        self.dropped.add(key)
+
+    def restore(self, project):
+        """Bring back the history drop() set aside, e.g. when a delete is undone."""
+        key = project.get("id")
+        if not key:
+            return
+        try:
+            os.replace(self._trash_file(key), self._file(key))
+        except FileNotFoundError:
+            return
+        self.dropped.discard(key)
+        self.counts.pop(key, None)
+
+    def clear(self):
+        self.counts.clear()
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(".jsonl"):
+                self._set_aside(name[:-len(".jsonl")])
+
+    def purge(self):
+        """Remove the histories this instance set aside; called once its deletes can't be undone."""
+        for key in self.dropped:
+            try:
+                os.remove(self._trash_file(key))
+            except FileNotFoundError:
+                pass
+        self.dropped.clear()
+        try:
+            os.rmdir(os.path.join(self.path, TRASH_DIR))
+        except OSError:
+            # Still holds another instance's deletes
+            pass
+
+    def migrate(self, project):
+        """Move a legacy inline ``history`` list out of the project record."""
+        return self.import_legacy(project, project.pop("history", None))
+
+    def import_legacy(self, project, legacy):
+        """Record an inline ``history`` list, e.g. from an old export, skipping entries already recorded."""
+        if not legacy or not isinstance(legacy, list):
+            return False
+        known = {entry.get("timestamp") for entry in self.load_project(project)}
+        for entry in legacy:
+            if isinstance(entry, dict) and (not entry.get("timestamp") or entry["timestamp"] not in known):
+                self.record(project, entry.get("old") or {}, entry.get("new") or {},
+                            entry.get("timestamp"))
+        return True
+
+    def on_change(self, op, project, app_data):
+        if op == "delete":
+            self.drop(project)
+        elif op == "add":
+            self.restore(project)
+        elif op == "reset":
+            self.clear()
+        elif op == "reload" and self.dropped:
+            # restore_projects puts a whole list back in one change
+            for p in app_data.get("projects", []):
+                if p.get("id") in self.dropped:
+                    self.restore(p)
@@ -0,0 +1,251 @@
+import json
+import os
+import threading
+import uuid
+
+from utils.filelock import DATA_LOCK
+from utils.project_index import ProjectIndex
+from utils.project_record import json_default
+
+JOURNAL_FILE = "app_data.journal"
+COMPACT_EVERY = 200  # Records appended before the snapshot is rewritten
+
+
+def apply_record(data, record, index=None):
+    """Apply one record; ``index`` is a ProjectIndex over data["projects"]."""
+    op = record.get("op")
+    projects = data.setdefault("projects", [])
+    if index is None:
+        index = ProjectIndex(projects)
+    if op == "add":
+        index.append(record["project"])
+    elif op == "update":
+        if "id" in record:
+            project = index.by_id[record["id"]]
+            if record.get("replace"):
+                # Written by undo/redo: fields is the whole project
+                project.clear()
+            project.update(record["fields"])
+        else:
+            projects[record["index"]].update(record["fields"])
+    elif op == "delete":
+        if "id" in record:
+            index.remove(record["id"])
+        else:
+            # Written before projects had IDs
+            del projects[record["index"]]
+            index.rebuild(projects)
+    elif op == "delete_many":
+        if "ids" in record:
+            index.remove_many(record["ids"])
+        else:
+            doomed = set(record["indexes"])
+            projects[:] = [p for i, p in enumerate(projects) if i not in doomed]
+            index.rebuild(projects)
+    elif op == "batch":
+        # One line in the journal, so a torn write loses the whole batch
+        for sub_record in record["records"]:
+            apply_record(data, sub_record, index)
+    elif op == "reset":
+        data["projects"] = []
+        index.rebuild(data["projects"])
+    elif op == "settings":
+        data["settings"] = record["settings"]
+    elif op == "mark":
+        # Sequence watermark left by discard_through
+        pass
+    else:
+        print(f"Skipping unknown journal record: {op}")
+
+
+class Journal:
+    """Append-only log of mutations made since the last snapshot.
+
+    Every record carries a sequence number and each snapshot stores the
+    last one it includes, so replay skips whatever a snapshot already
+    covers even if trimming the journal was interrupted.
+
+    Several processes may share the file. Appends happen under the data
+    lock and take the next sequence number after the last record on disk,
+    so file order is sequence order; each process tags its records with
+    its ``origin`` and picks up the others' with ``read_new``.
+    """
+
+    def __init__(self, path=JOURNAL_FILE, compact_every=COMPACT_EVERY):
+        self.path = path
+        self.compact_every = compact_every
+        self.pending = 0
+        self.seq = 0
+        self.origin = uuid.uuid4().hex[:12]
+        self.consumed = 0  # Every record up to this seq is reflected in memory
+        # (device, inode, first line) of the file ``offset`` refers to; the
+        # inode alone is not enough, a compaction may get the same one back
+        self.file_key = None
+        self.offset = 0  # Bytes of that file already read
+        self.mtime = None  # Its mtime when read up to ``offset``
+        # Appends come from the UI thread, trimming from the background saver;
+        # always taken after DATA_LOCK
+        self.lock = threading.Lock()
+
+    def append(self, record):
+        """Append one mutation record; returns True once compaction is due."""
+        with DATA_LOCK, self.lock:
+            caught_up = self._unread() == 0
+            # Caught up means seq is already past everything on disk
+            self.seq = max(self.seq, 0 if caught_up else self._last_seq()) + 1
+            record["seq"] = self.seq
+            record["origin"] = self.origin
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record, default=json_default) + "\n")
+            if caught_up:
+                # Nothing foreign to read before it, so skip our own line too
+                with open(self.path, "rb") as f:
+                    self._remember(f)
+                self.consumed = self.seq
+        self.pending += 1
+        return self.pending >= self.compact_every
+
+    def _remember(self, f):
+        """Mark all of the open journal file ``f`` as read."""
+        stat = os.fstat(f.fileno())
+        f.seek(0)
+        self.file_key = (stat.st_dev, stat.st_ino, f.readline())
+        self.offset, self.mtime = stat.st_size, stat.st_mtime_ns
+
+    def has_unread(self):
+        return self._unread() != 0
+
+    def _unread(self):
+        """Bytes of the journal not read yet; -1 if the file was replaced."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return -1 if self.file_key else 0
+        if self.file_key is None:
+            return -1 if stat.st_size else 0
+        if (stat.st_dev, stat.st_ino) != self.file_key[:2] or stat.st_size < self.offset:
+            return -1
+        if stat.st_mtime_ns == self.mtime and stat.st_size == self.offset:
+            return 0
+        with open(self.path, "rb") as f:
+            if f.readline() != self.file_key[2]:
+                return -1
+        if stat.st_size == self.offset:
+            self.mtime = stat.st_mtime_ns
+        return stat.st_size - self.offset
+
+    def _last_seq(self):
+        """Sequence number of the last record on disk, read from the tail."""
+        try:
+            with open(self.path, "rb") as f:
+                end = f.seek(0, os.SEEK_END)
+                tail = b""
+                while end > 0:
+                    step = min(4096, end)
+                    end -= step
+                    f.seek(end)
+                    tail = f.read(step) + tail
+                    lines = tail.rstrip(b"\n").split(b"\n")
+                    if len(lines) > 1 or end == 0:
+                        return json.loads(lines[-1]).get("seq", 0) if lines[-1].strip() else 0
+        except (FileNotFoundError, ValueError):
+            pass
+        return 0
+
+    def read_new(self):
+        """Records other processes appended since the last call, in order.
+
+        Our own records after the first of those are included too: they
+        were applied here before the older foreign ones, so they have to be
+        applied again on top to end up where replay would. Records trimmed
+        by another process's compaction are not seen here; check for a
+        replaced snapshot first, under the same lock.
+        """
+        if self._unread() == 0:
+            # The common case costs one stat and no lock
+            return []
+        records = []
+        with DATA_LOCK, self.lock:
+            if self._unread() < 0:
+                # Rewritten by a compaction; seq tells what was applied already
+                self.file_key, self.offset = None, 0
+            if not os.path.exists(self.path):
+                return records
+            with open(self.path, "rb") as f:
+                offset = self.offset
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Only a writer that crashed mid-line leaves this; replay cuts it off
+                        break
+                    offset += len(line)
+                    try:
+                        record = json.loads(line) if line.strip() else {}
+                    except ValueError:
+                        record = {}
+                    seq = record.get("seq", 0)
+                    if seq > self.consumed:
+                        self.consumed = seq
+                        self.seq = max(self.seq, seq)
+                        if records or record.get("origin") != self.origin:
+                            records.append(record)
+                self._remember(f)
+                self.offset = offset
+        return records
+
+    def replay(self, data, after=0):
+        """Apply the records after ``after`` to ``data``; reading continues from the end."""
+        self.seq = self.consumed = after
+        self.file_key, self.offset = None, 0
+        if not os.path.exists(self.path):
+            return data
+        intact = 0
+        torn = False
+        index = None
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    intact += len(line)
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    torn = True
+                    break
+                intact += len(line)
+                seq = record.get("seq", 0)
+                if seq and seq <= after:
+                    continue
+                if index is None:
+                    index = ProjectIndex(data.setdefault("projects", []))
+                try:
+                    apply_record(data, record, index)
+                except (KeyError, IndexError, TypeError) as e:
+                    print(f"Skipping invalid journal record: {e}")
+                self.seq = max(self.seq, seq)
+                self.pending += 1
+        if torn:
+            # A torn final write; cut it off so new records start on a clean line
+            print("Dropping truncated journal record")
+            os.truncate(self.path, intact)
+        with open(self.path, "rb") as f:
+            self._remember(f)
+        self.consumed = self.seq
+        return data
+
+    def discard_through(self, seq):
+        """Drop records up to ``seq`` once a snapshot containing them is on disk.
+
+        Other processes that had not read them yet merge that snapshot instead.
+        """
+        with DATA_LOCK, self.lock:
+            # Keeps appends numbering past the snapshot, and tells readers
+            # this is a new file even if it got the old inode back
+            kept = [json.dumps({"op": "mark", "seq": seq}) + "\n"]
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    kept += [line for line in f if line.strip() and json.loads(line).get("seq", 0) > seq]
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.writelines(kept)
+            os.replace(tmp_path, self.path)
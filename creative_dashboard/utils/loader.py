@@ -0,0 +1,102 @@
+import json
+import os
+
+from utils.filelock import DATA_LOCK
+from utils.project_record import as_record
+from utils.saver import atomic_write
+from utils.schema import DEFAULT_SETTINGS, SCHEMA_VERSION, migrate
+from utils.snapshot_cache import file_stamp, load_cache
+
+DATA_FILE = "app_data.json"
+
+# "json" keeps app_data.json plus its journal; "sqlite" uses app_data.db
+STORAGE_BACKEND = os.environ.get("TASKTEAL_STORAGE", "json")
+
+
+def open_project_store(backend=STORAGE_BACKEND):
+    if backend != "sqlite":
+        return None
+    # Imported here so the JSON backend never pays for sqlite3
+    from utils.sqlite_store import SQLiteStore
+    return SQLiteStore()
+
+
+def data_stamp(data_file=DATA_FILE):
+    """Cheap identity of the JSON snapshot on disk; None if there is none."""
+    try:
+        return file_stamp(data_file)
+    except FileNotFoundError:
+        return None
+
+
+def load_app_data(journal, history_store, project_store=None, data_file=DATA_FILE):
+    """Load app data for any entry point; returns ``(data, migrated)``.
+
+    Uses the SQLite store once it holds the data, otherwise the snapshot
+    cache from a clean shutdown, otherwise the JSON snapshot plus whatever
+    the journal recorded after it. Projects come back as ProjectRecords.
+    """
+    data = {}
+    migrated = False
+    migrate_store = False
+    if project_store and project_store.is_migrated():
+        data = project_store.load()
+        migrated = migrate(data, history_store)
+    else:
+        # Held so another process cannot compact between the two reads
+        with DATA_LOCK:
+            cached = load_cache(data_file)
+            if cached is not None:
+                # Clean shutdown last time: already validated
+                data, after = cached
+            else:
+                if os.path.exists(data_file):
+                    with open(data_file, "r") as f:
+                        data = json.load(f)
+                if data:
+                    migrated = migrate(data, history_store)
+                after = data.pop("journal_seq", 0)
+            # Mutations made since the last snapshot live in the journal
+            data = journal.replay(data, after=after)
+        migrate_store = project_store is not None
+    if not data:
+        data = {"projects": [], "settings": dict(DEFAULT_SETTINGS)}
+    data.setdefault("schema_version", SCHEMA_VERSION)
+    if "settings" not in data:
+        data["settings"] = dict(DEFAULT_SETTINGS)
+    data["projects"] = [as_record(p) for p in data.get("projects", [])]
+    if migrate_store:
+        print("Migrating app_data.json into the SQLite store")
+        project_store.replace_all(data)
+    return data, migrated
+
+
+def snapshot_data(data, journal_seq):
+    """What write_snapshot stores, detached from the live data so it can be written on another thread."""
+    snapshot = dict(data)
+    # Shallow copies are enough: project fields are plain strings
+    snapshot["projects"] = [p.to_dict() for p in data.get("projects", [])]
+    snapshot["settings"] = dict(data.get("settings", {}))
+    snapshot["journal_seq"] = journal_seq
+    return snapshot
+
+
+def write_snapshot(data, journal, expected_stamp, fsync=True, data_file=DATA_FILE, text=None):
+    """Replace the JSON snapshot, then trim the journal records it includes.
+
+    Nothing is written if the snapshot on disk is no longer the one with
+    ``expected_stamp``: another writer replaced it and has to be merged
+    first. Returns the new stamp, or None when the write was skipped.
+
+    ``text`` is ``data`` already serialized, for callers that take
+    DATA_LOCK themselves: serializing a large dataset under the lock
+    would stall every journal append meanwhile.
+    """
+    if text is None:
+        text = json.dumps(data)
+    with DATA_LOCK:
+        if data_stamp(data_file) != expected_stamp:
+            return None
+        atomic_write(data_file, text, fsync=fsync)
+        journal.discard_through(data["journal_seq"])
+        return data_stamp(data_file)
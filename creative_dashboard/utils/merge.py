@@ -0,0 +1,65 @@
+from utils.journal import apply_record
+from utils.project_record import as_record
+
+
+def apply_external(data, index, record, changes):
+    """Apply a record another process journaled; appends ``(op, project)`` to ``changes``.
+
+    Unlike replay, each change is reported so listeners can update
+    incrementally, and records about projects that are already gone here
+    are ignored rather than treated as corrupt.
+    """
+    op = record.get("op")
+    if op == "batch":
+        for sub_record in record["records"]:
+            apply_external(data, index, sub_record, changes)
+    elif op == "add":
+        project = as_record(record["project"])
+        if project.get("id") not in index:
+            index.append(project)
+            changes.append(("add", project))
+    elif op == "update":
+        project = index.get(record.get("id"))
+        if project is not None:
+            if record.get("replace"):
+                project.clear()
+            project.update(record["fields"])
+            changes.append(("update", project))
+    elif op == "delete":
+        project = index.remove(record.get("id"))
+        if project is not None:
+            changes.append(("delete", project))
+    elif op == "delete_many":
+        changes.extend(("delete", project) for project in index.remove_many(record.get("ids", [])))
+    elif op in ("reset", "settings"):
+        apply_record(data, record, index)
+        changes.append((op, None))
+    elif op == "mark":
+        pass
+    else:
+        print(f"Skipping unknown journal record: {op}")
+
+
+def merge_snapshot(data, index, latest, changes):
+    """Bring live data in line with ``latest``, touching only the projects that differ.
+
+    ``latest`` is what a fresh load would see: another writer's snapshot
+    with the journal replayed on top.
+    """
+    if latest.get("settings") is not None and latest["settings"] != data.get("settings"):
+        data["settings"] = latest["settings"]
+        changes.append(("settings", None))
+    incoming = {p["id"]: p for p in latest.get("projects", []) if p.get("id")}
+    for project_id, project in incoming.items():
+        live = index.get(project_id)
+        if live is None:
+            project = as_record(project)
+            index.append(project)
+            changes.append(("add", project))
+        elif live != project:
+            # In place, so widgets and indexes holding the dict stay valid
+            live.clear()
+            live.update(project)
+            changes.append(("update", live))
+    gone = [key for key in index.by_id if key not in incoming]
+    changes.extend(("delete", project) for project in index.remove_many(gone))
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+PROFILE_ENV = "TASKTEAL_PROFILE"
+TRACE_FILE = "trace.json"
+WINDOW = 512  # Most recent samples kept per timer
+TRACE_LIMIT = 50000  # Most recent spans kept for the trace file
+
+
+class RollingHistogram:
+    """Durations (ms) of the last ``size`` calls; percentiles are taken on demand."""
+
+    __slots__ = ("samples", "count")
+
+    def __init__(self, size=WINDOW):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+
+    def percentiles(self, points=(50, 95, 99)):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return [0.0 for _ in points]
+        return [ordered[min(len(ordered) - 1, len(ordered) * p // 100)] for p in points]
+
+
+class Profiler:
+    """Timing samples for the app's hot paths plus a Chrome-format trace.
+
+    While disabled the ``timed`` wrappers only check ``enabled`` and call
+    straight through; nothing is recorded or allocated.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.events = deque(maxlen=TRACE_LIMIT)
+
+    def record(self, name, start, end):
+        ms = (end - start) * 1000
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = RollingHistogram()
+            histogram.add(ms)
+            self.events.append((name, start, end, threading.get_ident()))
+
+    def summary(self):
+        """``(name, calls, p50, p95, p99)`` per timer, slowest p95 first."""
+        with self.lock:
+            rows = [(name, h.count, *h.percentiles()) for name, h in self.histograms.items()]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def dump(self, path=TRACE_FILE):
+        """Write the spans as a trace loadable in chrome://tracing or Perfetto."""
+        with self.lock:
+            events = list(self.events)
+        trace = {"traceEvents": [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": tid,
+            }
+            for name, start, end, tid in events
+        ]}
+        with open(path, "w") as f:
+            json.dump(trace, f)
+
+
+PROFILE_FROM_ENV = bool(os.environ.get(PROFILE_ENV))
+PROFILER = Profiler(enabled=PROFILE_FROM_ENV)
+
+
+def timed(name):
+    """Decorator recording each call of the wrapped function under ``name``."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                PROFILER.record(name, start, time.perf_counter())
+        return wrapper
+    return decorate
@@ -0,0 +1,104 @@
+import uuid
+
+from utils.project_record import ProjectRecord
+
+
+def new_project_id():
+    return uuid.uuid4().hex
+
+
+def project_id_of(project):
+    """The project's ID, assigning one if it has none yet."""
+    project_id = project.get("id")
+    if project_id is None:
+        project_id = project["id"] = new_project_id()
+    return project_id
+
+
+def make_project(name, category="General", due_date="", recurrence="None"):
+    return ProjectRecord(
+        id=new_project_id(),
+        name=name,
+        category=category,
+        status="Not Started",
+        emoji="📌",
+        due_date=due_date,
+        recurrence=recurrence
+    )
+
+
+class ProjectIndex:
+    """ID -> project map kept alongside the ordered app_data["projects"] list.
+
+    Lookups and updates go through ``by_id`` in O(1). List positions are
+    only needed to delete from the list; they are cached and a delete only
+    invalidates the positions after it, which are refilled on demand.
+    """
+
+    def __init__(self, projects=None):
+        self.rebuild([] if projects is None else projects)
+
+    def rebuild(self, projects):
+        self.projects = projects
+        self.by_id = {}
+        for project in projects:
+            self.by_id[project_id_of(project)] = project
+        self.positions = {}
+        self.valid_upto = 0  # positions[] is correct for list slots below this
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, project_id):
+        return project_id in self.by_id
+
+    def get(self, project_id):
+        return self.by_id.get(project_id)
+
+    def append(self, project):
+        project_id = project_id_of(project)
+        self.projects.append(project)
+        self.by_id[project_id] = project
+        if self.valid_upto == len(self.projects) - 1:
+            self.positions[project_id] = self.valid_upto
+            self.valid_upto += 1
+        return project_id
+
+    def position(self, project_id):
+        pos = self.positions.get(project_id)
+        if pos is not None and pos < self.valid_upto:
+            return pos
+        if project_id not in self.by_id:
+            return -1
+        projects = self.projects
+        while self.valid_upto < len(projects):
+            key = projects[self.valid_upto]["id"]
+            self.positions[key] = self.valid_upto
+            self.valid_upto += 1
+            if key == project_id:
+                return self.valid_upto - 1
+        return -1
+
+    def remove(self, project_id):
+        """Drop one project from the list and the map; returns it or None."""
+        pos = self.position(project_id)
+        if pos < 0:
+            return None
+        project = self.projects.pop(pos)
+        del self.by_id[project_id]
+        self.positions.pop(project_id, None)
+        self.valid_upto = min(self.valid_upto, pos)
+        return project
+
+    def remove_many(self, project_ids):
+        """Drop several projects in one pass over the list; returns them."""
+        removed = [self.by_id.pop(key) for key in set(project_ids) if key in self.by_id]
+        if removed:
+            self.projects[:] = [p for p in self.projects if p["id"] in self.by_id]
+            self.positions.clear()
+            self.valid_upto = 0
+        return removed
+
+    def on_change(self, op, project, app_data):
+        if op in ("reset", "reload"):
+            self.rebuild(app_data.setdefault("projects", []))
@@ -0,0 +1,183 @@
+import sys
+from collections.abc import Mapping, MutableMapping
+from datetime import date
+from enum import IntEnum
+
+
+class Status(IntEnum):
+    """Statuses in list order; OTHER sorts values this version does not know last."""
+    NOT_STARTED = 0
+    IN_PROGRESS = 1
+    COMPLETED = 2
+    OTHER = 3
+
+
+class Recurrence(IntEnum):
+    NONE = 0
+    DAILY = 1
+    WEEKLY = 2
+    MONTHLY = 3
+    OTHER = 4
+
+
+STATUS_CODES = {"Not Started": Status.NOT_STARTED, "In Progress": Status.IN_PROGRESS, "Completed": Status.COMPLETED}
+RECURRENCE_CODES = {"None": Recurrence.NONE, "Daily": Recurrence.DAILY, "Weekly": Recurrence.WEEKLY,
+                    "Monthly": Recurrence.MONTHLY}
+NO_DUE_DATE = date.max.toordinal()  # Sort key for projects without a usable due date
+
+FIELDS = ("id", "name", "category", "status", "emoji", "due_date", "recurrence", "completed_on", "anchor_date")
+# What a missing field reads as everywhere else in the app
+DERIVED_DEFAULTS = {"name": "", "status": "Not Started", "recurrence": "None", "due_date": ""}
+# Small vocabularies: one shared string instead of one per project
+SHARED_VALUES = frozenset(("category", "status", "emoji", "recurrence"))
+
+_FIELD_SET = frozenset(FIELDS)
+_MISSING = object()
+
+
+def date_ordinal(value):
+    """Day ordinal of a YYYY-MM-DD date, or None when missing or malformed."""
+    if not value or not isinstance(value, str) or len(value) != 10:
+        return None
+    try:
+        return date.fromisoformat(value).toordinal()
+    except ValueError:
+        return None
+
+
+class ProjectRecord(MutableMapping):
+    """One project: its JSON fields in slots plus sort keys derived from them.
+
+    Everything reads and writes it like the dict it replaces. Setting a
+    field refreshes what is derived from it, so sorts, stats and deadlines
+    use ``name_key``, ``status_code``, ``recurrence_code`` and
+    ``due_ordinal`` instead of re-parsing strings. Keys this version does
+    not know live in ``extra`` and round-trip unchanged.
+    """
+
+    __slots__ = FIELDS + ("extra", "name_key", "status_code", "recurrence_code", "due_ordinal")
+
+    def __init__(self, fields=(), **kwargs):
+        self.extra = None
+        self.name_key = ""
+        self.status_code = Status.NOT_STARTED
+        self.recurrence_code = Recurrence.NONE
+        self.due_ordinal = None
+        for key, value in (fields.items() if isinstance(fields, Mapping) else fields):
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def _derive(self, key, value):
+        if key == "name":
+            self.name_key = value.lower() if isinstance(value, str) else ""
+        elif key == "status":
+            self.status_code = STATUS_CODES.get(value, Status.OTHER)
+        elif key == "recurrence":
+            self.recurrence_code = RECURRENCE_CODES.get(value, Recurrence.OTHER)
+        elif key == "due_date":
+            self.due_ordinal = date_ordinal(value)
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        return self.extra.get(key, default) if self.extra else default
+
+    def __setitem__(self, key, value):
+        if key not in _FIELD_SET:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+            return
+        if key in SHARED_VALUES and type(value) is str:
+            value = sys.intern(value)
+        setattr(self, key, value)
+        if key in DERIVED_DEFAULTS:
+            self._derive(key, value)
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            if getattr(self, key, _MISSING) is _MISSING:
+                raise KeyError(key)
+            delattr(self, key)
+            if key in DERIVED_DEFAULTS:
+                self._derive(key, DERIVED_DEFAULTS[key])
+        elif self.extra and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in _FIELD_SET:
+            return getattr(self, key, _MISSING) is not _MISSING
+        return bool(self.extra) and key in self.extra
+
+    def __iter__(self):
+        for key in FIELDS:
+            if getattr(self, key, _MISSING) is not _MISSING:
+                yield key
+        if self.extra:
+            yield from list(self.extra)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def clear(self):
+        for key in FIELDS:
+            if getattr(self, key, _MISSING) is not _MISSING:
+                delattr(self, key)
+        self.extra = None
+        for key, value in DERIVED_DEFAULTS.items():
+            self._derive(key, value)
+
+    def copy(self):
+        """Shallow copy that keeps the derived keys instead of recomputing them."""
+        clone = ProjectRecord.__new__(ProjectRecord)
+        for key in self.__slots__:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                setattr(clone, key, value)
+        if clone.extra is not None:
+            clone.extra = dict(clone.extra)
+        return clone
+
+    def to_dict(self):
+        """The plain dict stored in JSON."""
+        fields = {}
+        for key in FIELDS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                fields[key] = value
+        if self.extra:
+            fields.update(self.extra)
+        return fields
+
+    def __eq__(self, other):
+        if isinstance(other, ProjectRecord):
+            other = other.to_dict()
+        elif not isinstance(other, Mapping):
+            return NotImplemented
+        return self.to_dict() == dict(other)
+
+    def __repr__(self):
+        return f"ProjectRecord({self.to_dict()!r})"
+
+
+def as_record(project):
+    return project if isinstance(project, ProjectRecord) else ProjectRecord(project)
+
+
+def json_default(value):
+    """``default=`` for json.dump(s) of anything that may contain projects."""
+    if isinstance(value, ProjectRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
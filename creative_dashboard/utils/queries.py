@@ -0,0 +1,60 @@
+from datetime import date
+from operator import attrgetter
+
+from utils.project_record import NO_DUE_DATE
+from utils.search_index import SearchIndex
+
+OPEN_STATUSES = ("Not Started", "In Progress")
+
+
+def filter_projects(projects, filter_status="All", filter_recurrence="All", search_text="",
+                    sort_by="Name", search_index=None):
+    """The project list's filters and sort order, shared by the screen and the CLI.
+
+    ``search_index`` must cover ``projects`` once built. Without one, a
+    Relevance sort builds a throwaway index and other searches scan; an
+    index still building on a worker scans too, in list order.
+    """
+    search_text = search_text.lower()
+    if search_text:
+        if search_index is None and sort_by == "Relevance":
+            search_index = SearchIndex()
+            search_index.rebuild(projects)
+        if search_index is None or not search_index.built:
+            projects = [
+                p for p in projects
+                if search_text in p.name_key or search_text in p.get("category", "").lower()
+            ]
+        elif sort_by == "Relevance":
+            projects = search_index.rank(search_text)
+        else:
+            projects = search_index.search(search_text)
+    filtered = [
+        p for p in projects
+        if (filter_status in ("All", "Archived") or
+            (filter_status == "Active" and p.get("status") in OPEN_STATUSES) or
+            (filter_status == "Completed" and p.get("status") == "Completed"))
+        and (filter_recurrence == "All" or p.get("recurrence") == filter_recurrence)
+    ]
+    # Keys precomputed on each ProjectRecord; no parsing or lowercasing per compare
+    if sort_by == "Name":
+        filtered.sort(key=attrgetter("name_key"))
+    elif sort_by == "Date":
+        filtered.sort(key=lambda x: x.due_ordinal or NO_DUE_DATE)
+    elif sort_by == "Status":
+        filtered.sort(key=attrgetter("status_code"))
+    return filtered
+
+
+def due_soon(projects, days, today=None):
+    """``(project, days_left)`` for open projects due within ``days``, overdue first."""
+    today = (today or date.today()).toordinal()
+    due = []
+    for project in projects:
+        if project.get("status") == "Completed" or project.due_ordinal is None:
+            continue
+        days_left = project.due_ordinal - today
+        if days_left <= days:
+            due.append((project, days_left))
+    due.sort(key=lambda entry: entry[1])
+    return due
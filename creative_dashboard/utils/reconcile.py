@@ -0,0 +1,52 @@
+def row_key(row):
+    # Rows are keyed by the ID of the project they display
+    return row["project_id"]
+
+
+def same_row(a, b):
+    if a.keys() != b.keys():
+        return False
+    for field, value in a.items():
+        other = b[field]
+        if value is not other and value != other:
+            return False
+    return True
+
+
+def reconcile(rows, new_rows, key=row_key):
+    """Patch ``rows`` in place until it matches ``new_rows``.
+
+    Rows that share a key at the same place are only replaced when their
+    content changed, and the differing middle section is swapped with one
+    slice assignment, so a single edit, insert or delete touches only the
+    rows involved. Returns the number of row slots written.
+    """
+    old_len = len(rows)
+    new_len = len(new_rows)
+    limit = min(old_len, new_len)
+    prefix = 0
+    while prefix < limit and key(rows[prefix]) == key(new_rows[prefix]):
+        prefix += 1
+    suffix = 0
+    while (suffix < limit - prefix
+           and key(rows[old_len - 1 - suffix]) == key(new_rows[new_len - 1 - suffix])):
+        suffix += 1
+
+    patches = [
+        i for i in range(prefix) if not same_row(rows[i], new_rows[i])
+    ] + [
+        new_len - 1 - i for i in range(suffix)
+        if not same_row(rows[old_len - 1 - i], new_rows[new_len - 1 - i])
+    ]
+    middle = new_len - prefix - suffix
+    if len(patches) + middle > new_len // 2 + 1:
+        # Reorders and restyles touch most rows anyway; replace in one go.
+        # Explicit bounds: Kivy's ObservableList cannot handle a bare [:]
+        rows[0:len(rows)] = new_rows
+        return new_len
+
+    for i in patches:
+        rows[i - new_len + old_len if i >= new_len - suffix else i] = new_rows[i]
+    if middle or old_len - prefix - suffix:
+        rows[prefix:old_len - suffix] = new_rows[prefix:new_len - suffix]
+    return len(patches) + middle
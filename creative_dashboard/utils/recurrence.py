@@ -0,0 +1,238 @@
+import calendar
+import json
+import os
+import uuid
+from datetime import date, timedelta
+
+LEDGER_FILE = "ledger.jsonl"
+
+
+def add_months(anchor, months):
+    month_index = anchor.month - 1 + months
+    year, month = anchor.year + month_index // 12, month_index % 12 + 1
+    # Clamp to the month's length so a series anchored on the 31st keeps going
+    return date(year, month, min(anchor.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrences(anchor, recurrence, start, end):
+    """Yield the dates of a series from ``start`` to ``end`` without materializing it."""
+    start = max(start, anchor)
+    if recurrence == "Daily":
+        day = start
+        while day <= end:
+            yield day
+            day += timedelta(days=1)
+    elif recurrence == "Weekly":
+        day = anchor + timedelta(days=-(-(start - anchor).days // 7) * 7)
+        while day <= end:
+            yield day
+            day += timedelta(days=7)
+    elif recurrence == "Monthly":
+        months = (start.year - anchor.year) * 12 + start.month - anchor.month
+        day = add_months(anchor, months)
+        while day <= end:
+            if day >= start:
+                yield day
+            months += 1
+            day = add_months(anchor, months)
+
+
+def next_occurrence(anchor, recurrence, after):
+    return next(occurrences(anchor, recurrence, after + timedelta(days=1), date.max), None)
+
+
+def period_of(day, recurrence):
+    """Consecutive integers for consecutive days, ISO weeks or months."""
+    if recurrence == "Weekly":
+        return (day.toordinal() - 1) // 7
+    if recurrence == "Monthly":
+        return day.year * 12 + day.month - 1
+    return day.toordinal()
+
+
+class Series:
+    __slots__ = ("name", "recurrence", "periods", "current", "best", "last")
+
+    def __init__(self, name, recurrence):
+        self.name = name
+        self.recurrence = recurrence
+        self.periods = set()
+        self.current = 0
+        self.best = 0
+        self.last = None
+
+    def add(self, period):
+        if period in self.periods:
+            return False
+        self.periods.add(period)
+        if self.last is None or period > self.last:
+            self.current = self.current + 1 if self.last is not None and period == self.last + 1 else 1
+            self.last = period
+        else:
+            # A late entry for an older period can join two runs; recount this series
+            self._recount()
+        self.best = max(self.best, self.current)
+        return True
+
+    def remove(self, period):
+        if period not in self.periods:
+            return False
+        self.periods.discard(period)
+        self.last = max(self.periods) if self.periods else None
+        self._recount()
+        return True
+
+    def _recount(self):
+        self.current = 0
+        if self.last is not None:
+            for p in range(self.last, min(self.periods) - 1, -1):
+                if p not in self.periods:
+                    break
+                self.current += 1
+        self.best = run = 0
+        for p in sorted(self.periods):
+            run = run + 1 if p - 1 in self.periods else 1
+            self.best = max(self.best, run)
+
+    def current_streak(self, today=None):
+        # A streak survives until a whole period passes without a completion
+        if self.last is None or self.last < period_of(today or date.today(), self.recurrence) - 1:
+            return 0
+        return self.current
+
+
+class CompletionLedger:
+    """Append-only record of completed occurrences per recurring series.
+
+    The file is read the first time streaks are needed; after that each
+    completion updates its series' current and best streak directly.
+    Undoing a completion appends a removal rather than rewriting the file,
+    and deleting a project appends a line hiding its series until the
+    project is added back.
+    """
+
+    def __init__(self, path=LEDGER_FILE):
+        self.path = path
+        self.series = None
+        self.hidden = set()  # Series of deleted projects
+        self.set_aside = []  # Files clear() moved away, newest last
+
+    def ensure_loaded(self):
+        if self.series is not None:
+            return
+        self.series = {}
+        self.hidden = set()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self._add(entry)
+
+    def _add(self, entry):
+        if "hidden" in entry:
+            if entry["hidden"]:
+                self.hidden.add(entry["series"])
+            else:
+                self.hidden.discard(entry["series"])
+            return True
+        series = self.series.get(entry["series"])
+        if entry.get("removed"):
+            return series is not None and series.remove(entry["period"])
+        if series is None:
+            series = self.series[entry["series"]] = Series(entry["name"], entry["recurrence"])
+        series.name = entry["name"]
+        return series.add(entry["period"])
+
+    def record(self, series_key, name, recurrence, occurrence):
+        self.ensure_loaded()
+        entry = {
+            "series": series_key,
+            "name": name,
+            "recurrence": recurrence,
+            "period": period_of(occurrence, recurrence),
+            "date": occurrence.isoformat()
+        }
+        if self._add(entry):
+            self._append(entry)
+            return entry
+        return None
+
+    def unrecord(self, entry):
+        """Take back a completion record() logged, e.g. when it is undone."""
+        self.ensure_loaded()
+        removal = {"series": entry["series"], "period": entry["period"], "removed": True}
+        if self._add(removal):
+            self._append(removal)
+
+    def hide(self, series_key, hidden=True):
+        """Leave a deleted project's series out of streaks(); ``hidden=False`` brings it back."""
+        if (series_key in self.hidden) == hidden:
+            return
+        entry = {"series": series_key, "hidden": hidden}
+        self._add(entry)
+        self._append(entry)
+
+    def _append(self, entry):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def streaks(self, today=None):
+        """``(name, recurrence, current, best)`` for every series with a completion."""
+        self.ensure_loaded()
+        return [
+            (s.name, s.recurrence, s.current_streak(today), s.best)
+            for key, s in self.series.items() if key not in self.hidden
+        ]
+
+    def clear(self):
+        """Start over; the old file is kept for restore() until purge()."""
+        self.series = {}
+        self.hidden = set()
+        aside = None
+        if os.path.exists(self.path):
+            aside = f"{self.path}.{uuid.uuid4().hex}.deleted"
+            os.replace(self.path, aside)
+        # None too, so each undone reset restores its own file
+        self.set_aside.append(aside)
+
+    def restore(self):
+        """Bring back what the last clear() moved away, followed by anything recorded since."""
+        if not self.set_aside:
+            return
+        aside = self.set_aside.pop()
+        if aside is None:
+            return
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                recent = f.read()
+            with open(aside, "a") as f:
+                f.write(recent)
+        os.replace(aside, self.path)
+        # Read again on next use
+        self.series = None
+
+    def purge(self):
+        for aside in filter(None, self.set_aside):
+            try:
+                os.remove(aside)
+            except FileNotFoundError:
+                pass
+        self.set_aside.clear()
+
+    def on_change(self, op, project, app_data):
+        if op == "delete" and project.get("id"):
+            # Decided without reading the file unless it is loaded already
+            if project.get("recurrence", "None") != "None" or (self.series and project["id"] in self.series):
+                self.hide(project["id"])
+        elif op == "add" and project.get("id") in self.hidden:
+            # Undoing the delete
+            self.hide(project["id"], hidden=False)
+        elif op == "reset":
+            self.clear()
+        elif op == "reload":
+            # restore_projects undoing a reset
+            self.restore()
@@ -0,0 +1,93 @@
+import os
+import threading
+
+FSYNC_POLICIES = ("always", "exit", "never")
+CLOSE_TIMEOUT = 30.0  # Seconds close() waits for the last write
+
+
+def atomic_write(path, text, fsync=True):
+    """Write ``text`` to a temp file and rename it over ``path``."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable as well
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class BackgroundSaver:
+    """Single worker thread that writes the most recent submitted snapshot.
+
+    Submitting while a write is queued replaces the queued snapshot, so a
+    burst of saves results in at most one write in flight plus one queued.
+    """
+
+    def __init__(self, write):
+        self.write = write
+        self.condition = threading.Condition()
+        self.pending = None
+        self.busy = False
+        self.closed = False
+        self.stopped = False  # Set by the worker thread as it exits
+        self.thread = threading.Thread(target=self._run, name="app-data-saver", daemon=True)
+        self.thread.start()
+
+    def submit(self, snapshot):
+        """Queue ``snapshot``; returns False, writing nothing, once the saver is closed."""
+        with self.condition:
+            if self.closed:
+                return False
+            self.pending = snapshot
+            self.condition.notify_all()
+            return True
+
+    def _run(self):
+        try:
+            self._loop()
+        finally:
+            with self.condition:
+                self.stopped = True
+                self.condition.notify_all()
+
+    def _loop(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                if self.pending is None:
+                    return
+                snapshot, self.pending = self.pending, None
+                self.busy = True
+            try:
+                self.write(snapshot)
+            except Exception as e:
+                print(f"Error saving data: {e}")
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Block until every submitted snapshot has been written; False on timeout or if the worker died."""
+        with self.condition:
+            self.condition.wait_for(
+                lambda: (self.pending is None and not self.busy) or self.stopped or not self.thread.is_alive(),
+                timeout,
+            )
+            return self.pending is None and not self.busy
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """Write what is queued, then stop the worker. Safe to call more than once."""
+        flushed = self.flush(timeout)
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+        return flushed
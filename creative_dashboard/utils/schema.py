@@ -0,0 +1,58 @@
+from utils.project_index import new_project_id
+
+SCHEMA_VERSION = 2
+
+DEFAULT_SETTINGS = {"theme": "System Default", "notifications": True, "font_scale": "Medium", "profiling": False}
+
+
+def validate_projects(data, history_store):
+    """0 -> 1: fill missing fields, convert string projects, move inline history out."""
+    validated_projects = []
+    for p in data.get("projects", []):
+        if isinstance(p, dict) and "name" in p:
+            p.setdefault("status", "Not Started")
+            p.setdefault("emoji", "📌")
+            p.setdefault("recurrence", "None")
+            p.setdefault("due_date", "")
+            if "history" in p:
+                history_store.migrate(p)
+            validated_projects.append(p)
+        elif isinstance(p, str):
+            print(f"Converting string project '{p}' to dictionary")
+            validated_projects.append({
+                "name": p,
+                "category": "General",
+                "status": "Not Started",
+                "emoji": "📌",
+                "recurrence": "None",
+                "due_date": ""
+            })
+        else:
+            print(f"Skipping invalid project entry: {p}")
+    data["projects"] = validated_projects
+
+
+def assign_ids(data, history_store):
+    """1 -> 2: give every project a stable ID usable as a persistence key."""
+    for p in data.get("projects", []):
+        if not p.get("id"):
+            p["id"] = new_project_id()
+
+
+# MIGRATIONS[n] upgrades data from schema version n to n + 1
+MIGRATIONS = [
+    validate_projects,
+    assign_ids,
+]
+
+
+def migrate(data, history_store):
+    """Bring ``data`` up to SCHEMA_VERSION; returns True if anything ran."""
+    version = data.get("schema_version", 0)
+    if version > SCHEMA_VERSION:
+        print(f"Data schema {version} is newer than this app ({SCHEMA_VERSION})")
+        return False
+    for step in MIGRATIONS[version:]:
+        step(data, history_store)
+    data["schema_version"] = SCHEMA_VERSION
+    return version < SCHEMA_VERSION
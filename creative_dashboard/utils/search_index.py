@@ -0,0 +1,178 @@
+import threading
+from collections import Counter
+
+FUZZY_THRESHOLD = 0.5  # Share of query trigrams a fuzzy match must contain
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Trigram index over project names and categories.
+
+    Entries are keyed by project ID and kept in list order, so
+    results come back in the same order as app_data["projects"].
+
+    Given ``post(callback)``, which runs ``callback`` on the owning
+    thread, start_build() builds on a worker; changes that arrive
+    meanwhile are queued and applied once the new index is swapped in.
+    """
+
+    def __init__(self, post=None):
+        self.entries = {}  # key -> (seq, project, name, category)
+        self.postings = {}  # trigram -> set of keys
+        self.next_seq = 0
+        self.last_query = None
+        self.last_keys = None
+        self.built = False
+        self.post = post
+        self.pending = None  # Changes seen while a worker builds
+        self.generation = 0
+        self.on_ready = None
+
+    def ensure_built(self, projects):
+        """Start building if nothing has yet; True once searches can use the index."""
+        if not self.built and self.pending is None:
+            self.start_build(projects)
+        return self.built
+
+    def start_build(self, projects):
+        if self.post is None:
+            self.rebuild(projects)
+            return
+        self.built = False
+        self.generation += 1
+        self.pending = []
+        threading.Thread(target=self._build, args=(self.generation, list(projects)),
+                         name="search-index", daemon=True).start()
+
+    def _build(self, generation, projects):
+        index = SearchIndex()
+        index.rebuild(projects)
+        self.post(lambda: self._install(generation, index))
+
+    def _install(self, generation, index):
+        if generation != self.generation:
+            # A later build replaced this one
+            return
+        self.entries, self.postings, self.next_seq = index.entries, index.postings, index.next_seq
+        self.last_query = None
+        self.built = True
+        pending, self.pending = self.pending, None
+        for op, project in pending:
+            self._apply(op, project)
+        if self.on_ready:
+            self.on_ready()
+
+    def rebuild(self, projects):
+        self.built = True
+        self.entries.clear()
+        self.postings.clear()
+        self.next_seq = 0
+        for project in projects:
+            self.add(project)
+
+    def add(self, project):
+        key = project["id"]
+        name = project.name_key
+        category = project.get("category", "").lower()
+        if key in self.entries:
+            seq = self.entries[key][0]
+            self._unindex(key)
+        else:
+            seq = self.next_seq
+            self.next_seq += 1
+        self.entries[key] = (seq, project, name, category)
+        for gram in trigrams(name) | trigrams(category):
+            self.postings.setdefault(gram, set()).add(key)
+        self.last_query = None
+
+    def remove(self, project):
+        key = project["id"]
+        if key in self.entries:
+            self._unindex(key)
+            del self.entries[key]
+        self.last_query = None
+
+    def _unindex(self, key):
+        _, _, name, category = self.entries[key]
+        for gram in trigrams(name) | trigrams(category):
+            keys = self.postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.postings[gram]
+
+    def on_change(self, op, project, app_data):
+        if op in ("reset", "reload"):
+            if self.built or self.pending is not None:
+                self.start_build(app_data.get("projects", []))
+        elif self.pending is not None:
+            self.pending.append((op, project))
+        elif self.built:
+            self._apply(op, project)
+
+    def _apply(self, op, project):
+        if op in ("add", "update"):
+            self.add(project)
+        elif op == "delete":
+            self.remove(project)
+
+    def _matches(self, query, keys):
+        entries = self.entries
+        return [
+            key for key in keys
+            if query in entries[key][2] or query in entries[key][3]
+        ]
+
+    def search_keys(self, query):
+        query = query.lower()
+        if not query:
+            return list(self.entries)
+        if self.last_query and self.last_query in query:
+            # The user extended the query: refine the previous hits only
+            candidates = self.last_keys
+        else:
+            candidates = None
+            for gram in trigrams(query):
+                keys = self.postings.get(gram, set())
+                candidates = keys if candidates is None or len(keys) < len(candidates) else candidates
+                if not keys:
+                    break
+            if candidates is None:
+                candidates = self.entries
+        keys = self._matches(query, candidates)
+        self.last_query = query
+        self.last_keys = keys
+        return keys
+
+    def search(self, query):
+        """Return projects whose name or category contain ``query``, in list order."""
+        keys = self.search_keys(query)
+        entries = self.entries
+        keys.sort(key=lambda key: entries[key][0])
+        return [entries[key][1] for key in keys]
+
+    def rank(self, query):
+        """Return substring and fuzzy matches ordered by relevance."""
+        query = query.lower()
+        grams = trigrams(query)
+        scores = Counter()
+        for gram in grams:
+            for key in self.postings.get(gram, ()):
+                scores[key] += 1
+        for key in self.search_keys(query):
+            scores[key] += len(grams) + 1
+        entries = self.entries
+        ranked = []
+        for key, score in scores.items():
+            score = score / (len(grams) or 1)
+            if score < FUZZY_THRESHOLD:
+                continue
+            name = entries[key][2]
+            if name.startswith(query):
+                score += 1
+            ranked.append((-score, entries[key][0], key))
+        ranked.sort()
+        return [entries[key][1] for _, _, key in ranked]
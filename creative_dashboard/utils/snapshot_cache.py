@@ -0,0 +1,49 @@
+import os
+import pickle
+
+from utils.schema import SCHEMA_VERSION
+
+CACHE_FILE = "app_data.cache"
+CACHE_VERSION = 1
+
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def write_cache(data, journal_seq, data_file, path=CACHE_FILE):
+    """Pickle already-validated app data next to the JSON snapshot it mirrors."""
+    payload = {
+        "version": CACHE_VERSION,
+        "schema_version": data.get("schema_version"),
+        "stamp": file_stamp(data_file),
+        "journal_seq": journal_seq,
+        "data": data,
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_cache(data_file, path=CACHE_FILE):
+    """Return ``(data, journal_seq)`` if the cache still matches, else None.
+
+    The cache only counts while the JSON snapshot is byte-for-byte the one
+    it was written against; journal records after ``journal_seq`` are
+    replayed on top as usual.
+    """
+    try:
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+        if (payload.get("version") != CACHE_VERSION
+                or payload.get("schema_version") != SCHEMA_VERSION
+                or payload.get("stamp") != file_stamp(data_file)):
+            return None
+        return payload["data"], payload["journal_seq"]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring snapshot cache: {e}")
+        return None
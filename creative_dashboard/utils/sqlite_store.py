@@ -0,0 +1,175 @@
+import json
+import os
+import sqlite3
+
+from utils.project_record import json_default
+
+DB_FILE = "app_data.db"
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    pos INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    category TEXT,
+    status TEXT,
+    recurrence TEXT,
+    due_date TEXT,
+    data TEXT NOT NULL,
+    id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_projects_pos ON projects (pos);
+CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status, pos);
+CREATE INDEX IF NOT EXISTS idx_projects_recurrence ON projects (recurrence, pos);
+CREATE INDEX IF NOT EXISTS idx_projects_category ON projects (category, pos);
+CREATE INDEX IF NOT EXISTS idx_projects_due_date ON projects (due_date, pos);
+CREATE INDEX IF NOT EXISTS idx_projects_name ON projects (name_lower, pos);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+STATUS_ORDER = ["Not Started", "In Progress", "Completed"]
+
+# Named columns: stores created before IDs have the id column at the end
+INSERT_PROJECT = (
+    "INSERT INTO projects (pos, id, name, name_lower, category, status, recurrence, due_date, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+ORDER_BY = {
+    "Name": "name_lower, pos",
+    "Date": "due_date = '', due_date, pos",
+    "Status": "CASE status WHEN 'Not Started' THEN 0 WHEN 'In Progress' THEN 1 "
+              "WHEN 'Completed' THEN 2 ELSE 3 END, pos",
+}
+
+
+def project_row(pos, project):
+    return (
+        pos,
+        project["id"],
+        project.get("name", ""),
+        project.get("name", "").lower(),
+        project.get("category", "General"),
+        project.get("status", "Not Started"),
+        project.get("recurrence", "None"),
+        project.get("due_date", ""),
+        json.dumps(project, default=json_default),
+    )
+
+
+class SQLiteStore:
+    """Mirrors app_data in one local SQLite file and answers list queries.
+
+    Rows are keyed by project ID; ``pos`` only orders them, so deleting a
+    project never renumbers the rows after it.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self.is_new = not os.path.exists(path)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(projects)")]
+        if "id" not in columns:
+            # IDs are filled in when the app rewrites its migrated data
+            self.conn.execute("ALTER TABLE projects ADD COLUMN id TEXT")
+        self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_projects_id ON projects (id)")
+
+    def close(self):
+        self.conn.close()
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value))
+        )
+
+    def is_migrated(self):
+        return self.get_meta("schema_version") is not None
+
+    def load(self):
+        projects = [
+            json.loads(row[0])
+            for row in self.conn.execute("SELECT data FROM projects ORDER BY pos")
+        ]
+        data = {"projects": projects, "schema_version": self.get_meta("app_schema_version", 0)}
+        settings = self.get_meta("settings")
+        if settings is not None:
+            data["settings"] = settings
+        return data
+
+    def replace_all(self, data):
+        """Rewrite the whole store; also the migration path from app_data.json."""
+        with self.conn:
+            self.conn.execute("DELETE FROM projects")
+            self.conn.executemany(
+                INSERT_PROJECT,
+                (project_row(pos, p) for pos, p in enumerate(data.get("projects", []))),
+            )
+            if "settings" in data:
+                self._set_meta("settings", data["settings"])
+            self._set_meta("app_schema_version", data.get("schema_version", 0))
+            self._set_meta("schema_version", SCHEMA_VERSION)
+
+    def apply(self, record):
+        """Apply one journal-style mutation record in its own transaction."""
+        with self.conn:
+            self._apply(record)
+
+    def _apply(self, record):
+        op = record.get("op")
+        if op == "add":
+            pos = self.conn.execute("SELECT COALESCE(MAX(pos) + 1, 0) FROM projects").fetchone()[0]
+            self.conn.execute(INSERT_PROJECT, project_row(pos, record["project"]))
+        elif op == "update":
+            row = self.conn.execute("SELECT pos, data FROM projects WHERE id = ?", (record["id"],)).fetchone()
+            if row is None:
+                raise KeyError(f"No project with id {record['id']}")
+            project = {} if record.get("replace") else json.loads(row[1])
+            project.update(record["fields"])
+            self.conn.execute("DELETE FROM projects WHERE id = ?", (record["id"],))
+            self.conn.execute(INSERT_PROJECT, project_row(row[0], project))
+        elif op == "delete":
+            self.conn.execute("DELETE FROM projects WHERE id = ?", (record["id"],))
+        elif op == "delete_many":
+            self.conn.executemany("DELETE FROM projects WHERE id = ?", ((key,) for key in record["ids"]))
+        elif op == "batch":
+            for sub_record in record["records"]:
+                self._apply(sub_record)
+        elif op == "reset":
+            self.conn.execute("DELETE FROM projects")
+        elif op == "settings":
+            self._set_meta("settings", record["settings"])
+        else:
+            print(f"Skipping unknown store record: {op}")
+
+    def query(self, filter_status="All", filter_recurrence="All", search_text="", sort_by="Name",
+              limit=None, offset=0):
+        """Return the IDs of matching projects in display order."""
+        clauses = []
+        params = []
+        if filter_status == "Active":
+            clauses.append("status IN ('Not Started', 'In Progress')")
+        elif filter_status == "Completed":
+            clauses.append("status = 'Completed'")
+        if filter_recurrence != "All":
+            clauses.append("recurrence = ?")
+            params.append(filter_recurrence)
+        if search_text:
+            clauses.append("(instr(name_lower, ?) > 0 OR instr(lower(category), ?) > 0)")
+            params += [search_text.lower(), search_text.lower()]
+        sql = "SELECT id FROM projects"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY " + ORDER_BY.get(sort_by, "pos")
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [row[0] for row in self.conn.execute(sql, params)]
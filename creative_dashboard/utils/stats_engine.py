@@ -0,0 +1,149 @@
+from collections import Counter
+from datetime import date, timedelta
+
+from utils.project_record import date_ordinal
+
+
+class StatsEngine:
+    """Aggregates over app_data["projects"] kept as running counters.
+
+    Every project's contribution is remembered, so a change subtracts the
+    old contribution and adds the new one in O(1); reading the stats never
+    touches the project list.
+    """
+
+    def __init__(self):
+        self.archived = 0  # Completed projects rolled into the weekly archive
+        self.archived_due = Counter()  # Their due and completion days, kept apart
+        self.archived_completed = Counter()  # from the live counters reset() clears
+        self.version = 0  # Bumped on every change; lets caches key on the data
+        self.reset()
+
+    def reset(self):
+        self.contributions = {}
+        self.by_status = Counter()
+        self.by_category = Counter()
+        self.by_recurrence = Counter()
+        self.by_due_day = Counter()
+        self.open_by_due_day = Counter()
+        self.by_completed_day = Counter()
+        self.version += 1
+
+    def rebuild(self, projects):
+        self.reset()
+        for project in projects:
+            self.add(project)
+
+    def set_archived(self, count=0, due_days=None, completed_days=None):
+        """Fold in the weekly archive, from archived_count() and archived_day_counts()."""
+        self.archived = count
+        self.archived_due = Counter(due_days or {})
+        self.archived_completed = Counter(completed_days or {})
+        self.version += 1
+
+    def _contribution(self, project):
+        status = project.get("status", "Not Started")
+        due_day = project.due_ordinal
+        return (
+            status,
+            project.get("category", "General"),
+            project.get("recurrence", "None"),
+            due_day,
+            due_day if status != "Completed" else None,
+            date_ordinal(project.get("completed_on", "")) if status == "Completed" else None,
+        )
+
+    def _apply(self, contribution, sign):
+        self.version += 1
+        status, category, recurrence, due_day, open_due_day, completed_day = contribution
+        for counter, key in (
+            (self.by_status, status),
+            (self.by_category, category),
+            (self.by_recurrence, recurrence),
+            (self.by_due_day, due_day),
+            (self.open_by_due_day, open_due_day),
+            (self.by_completed_day, completed_day),
+        ):
+            if key is None:
+                continue
+            counter[key] += sign
+            if not counter[key]:
+                del counter[key]
+
+    def add(self, project):
+        key = project["id"]
+        if key in self.contributions:
+            self._apply(self.contributions[key], -1)
+        contribution = self._contribution(project)
+        self.contributions[key] = contribution
+        self._apply(contribution, 1)
+
+    def remove(self, project):
+        contribution = self.contributions.pop(project["id"], None)
+        if contribution is not None:
+            self._apply(contribution, -1)
+
+    def on_change(self, op, project, app_data):
+        if op in ("add", "update"):
+            self.add(project)
+        elif op == "delete":
+            self.remove(project)
+        elif op in ("reset", "reload"):
+            self.rebuild(app_data.get("projects", []))
+
+    @property
+    def total(self):
+        return len(self.contributions) + self.archived
+
+    @property
+    def completed(self):
+        return self.by_status["Completed"] + self.archived
+
+    def due_between(self, start, end):
+        """Number of projects due from ``start`` to ``end`` (dates, inclusive)."""
+        start, end = start.toordinal(), end.toordinal()
+        return sum(self._count_between(counter, start, end) for counter in (self.by_due_day, self.archived_due))
+
+    @staticmethod
+    def _count_between(counter, start, end):
+        if end - start < len(counter):
+            return sum(counter.get(day, 0) for day in range(start, end + 1))
+        return sum(count for day, count in counter.items() if start <= day <= end)
+
+    def chart_data(self, days=30, today=None):
+        """Small, plain series for the Stats charts, built from the counters."""
+        today = (today or date.today()).toordinal()
+        open_total = sum(v for k, v in self.by_status.items() if k != "Completed")
+        # Open work left if everything is finished on its due date
+        remaining = open_total - sum(v for day, v in self.open_by_due_day.items() if day < today)
+        burndown = []
+        for day in range(today, today + days):
+            remaining -= self.open_by_due_day.get(day, 0)
+            burndown.append(remaining)
+        return {
+            "burndown": (today, [open_total] + burndown),
+            "completion": (today - days + 1, [self.by_completed_day.get(day, 0) + self.archived_completed.get(day, 0)
+                                              for day in range(today - days + 1, today + 1)]),
+            "category": sorted(self.by_category.items()),
+        }
+
+    def summary(self, today=None):
+        """The figures the Stats screen and the CLI report."""
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "due_last_7_days": self.due_in_last_days(7, today),
+            "due_per_week": self.due_per_week(4, today),
+        }
+
+    def due_in_last_days(self, days, today=None):
+        today = today or date.today()
+        return self.due_between(today - timedelta(days=days), today)
+
+    def due_per_week(self, weeks, today=None):
+        """Projects due in each of the last ``weeks`` weeks, oldest first."""
+        today = today or date.today()
+        return [
+            self.due_between(today - timedelta(days=7 * (n + 1) - 1), today - timedelta(days=7 * n))
+            for n in reversed(range(weeks))
+        ]
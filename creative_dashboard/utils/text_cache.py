@@ -0,0 +1,81 @@
+from collections import OrderedDict
+
+from kivy.core.text import Label as CoreLabel
+from kivy.factory import Factory
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+
+TEXT_CACHE_SIZE = 512  # Rendered captions kept on the GPU
+
+
+def _frozen(value):
+    if isinstance(value, dict):
+        return tuple(sorted((name, _frozen(v)) for name, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+
+class TextTextureCache:
+    """Bounded LRU of rendered text textures shared by every cached label.
+
+    Keys cover the text and every core-label option (font, size, color,
+    padding, ...), so identical captions are rasterized once.
+    """
+
+    def __init__(self, size=TEXT_CACHE_SIZE):
+        self.size = size
+        self.textures = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, usersize, options):
+        key = (text, _frozen(usersize), _frozen({
+            name: value for name, value in options.items() if name != "text"
+        }))
+        texture = self.textures.get(key)
+        if texture is not None:
+            self.textures.move_to_end(key)
+            self.hits += 1
+            return texture
+        self.misses += 1
+        # A core label reuses its texture between refreshes, so each cached
+        # texture needs a core label of its own
+        core = CoreLabel(**dict(options, text=text, text_size=usersize))
+        core.refresh()
+        texture = core.texture
+        if texture is not None:
+            self.textures[key] = texture
+            if len(self.textures) > self.size:
+                self.textures.popitem(last=False)
+        return texture
+
+    def clear(self):
+        self.textures.clear()
+
+
+TEXT_TEXTURES = TextTextureCache()
+
+
+class CachedTextMixin:
+    """Label behaviour that takes its texture from ``TEXT_TEXTURES``."""
+
+    def texture_update(self, *largs):
+        if self.markup or self.shorten or not self.text or self.strip or self.halign == 'justify':
+            return super().texture_update(*largs)
+        texture = TEXT_TEXTURES.get(self.text, self._label.usersize, self._label.options)
+        self.texture = texture
+        self.texture_size = list(texture.size) if texture is not None else (0, 0)
+        self.is_shortened = False
+
+
+class CachedLabel(CachedTextMixin, Label):
+    pass
+
+
+class CachedButton(CachedTextMixin, Button):
+    pass
+
+
+Factory.register("CachedLabel", cls=CachedLabel)
+Factory.register("CachedButton", cls=CachedButton)
@@ -0,0 +1,118 @@
+import json
+import os
+
+from utils.project_record import as_record, json_default
+
+FORMAT_NAME = "taskteal-ndjson"
+FORMAT_VERSION = 1
+
+
+def export_lines(app_data):
+    """Yield the line-delimited export one record at a time."""
+    yield json.dumps({"type": "header", "format": FORMAT_NAME, "version": FORMAT_VERSION}) + "\n"
+    yield json.dumps({"type": "settings", "settings": app_data.get("settings", {})}) + "\n"
+    for project in app_data.get("projects", []):
+        yield json.dumps({"type": "project", "project": project}, default=json_default) + "\n"
+
+
+def export_to(path, app_data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        for line in export_lines(app_data):
+            f.write(line)
+    os.replace(tmp_path, path)
+
+
+def read_records(path):
+    """Yield ``(record, bytes_read, total_bytes)`` from an export file.
+
+    ``.ndjson``/``.jsonl`` files are streamed line by line. Older whole-file
+    ``.json`` exports are still accepted and turned into the same records.
+    """
+    total = os.path.getsize(path) or 1
+    if not path.endswith((".ndjson", ".jsonl")):
+        with open(path, "r") as f:
+            data = json.load(f)
+        if "settings" in data:
+            yield {"type": "settings", "settings": data["settings"]}, 0, total
+        projects = data.get("projects", [])
+        for n, project in enumerate(projects, 1):
+            yield {"type": "project", "project": project}, total * n // len(projects), total
+        return
+    with open(path, "rb") as f:
+        position = 0
+        for line in f:
+            position += len(line)
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line), position, total
+            except ValueError:
+                print(f"Skipping malformed import line at byte {position}")
+
+
+def field_key(project):
+    return ("fields", project.get("name", "").strip().lower(),
+            project.get("category", "General"), project.get("due_date", ""))
+
+
+def dedupe_key(project):
+    if project.get("id"):
+        return ("id", project["id"])
+    return field_key(project)
+
+
+class ProjectMerger:
+    """Match imported projects against the existing list instead of replacing it.
+
+    Existing projects are known by ID and by their fields, so exports made
+    before projects had IDs still merge instead of duplicating. Inline
+    history in old exports goes to ``history_store``, when one is given.
+    """
+
+    def __init__(self, projects, history_store=None):
+        self.history_store = history_store
+        self.existing = {}
+        for project in projects:
+            self._register(project)
+        self.added = 0
+        self.updated = 0
+        self.skipped = 0
+
+    def _register(self, project):
+        if project.get("id"):
+            self.existing.setdefault(("id", project["id"]), project)
+        self.existing.setdefault(field_key(project), project)
+
+    def merge(self, project):
+        """Return ``("add" | "update" | None, target, fields)`` for one import."""
+        if isinstance(project, str):
+            project = {"name": project}
+        if not isinstance(project, dict) or not project.get("name"):
+            self.skipped += 1
+            return None, None, None
+        legacy = project.pop("history", None)
+        key = dedupe_key(project)
+        target = self.existing.get(key)
+        if target is None:
+            project.setdefault("category", "General")
+            project.setdefault("status", "Not Started")
+            project.setdefault("emoji", "📌")
+            project.setdefault("recurrence", "None")
+            project.setdefault("due_date", "")
+            project = as_record(project)
+            self._import_history(project, legacy)
+            self._register(project)
+            self.added += 1
+            return "add", project, None
+        fields = {k: v for k, v in project.items() if target.get(k) != v}
+        if not fields:
+            self.skipped += 1
+            return None, target, None
+        self._import_history(target, legacy)
+        self.updated += 1
+        return "update", target, fields
+
+    def _import_history(self, project, legacy):
+        if legacy and self.history_store is not None:
+            self.history_store.import_legacy(project, legacy)
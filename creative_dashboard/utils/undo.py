@@ -0,0 +1,181 @@
+from collections import deque
+from contextlib import contextmanager
+from datetime import date
+
+UNDO_LIMIT = 200  # Steps kept; older ones are dropped
+
+
+class UndoStack:
+    """Undo and redo for the changes recorded through MainApp.record_change.
+
+    A step is every change one action made: a transaction, an import, a
+    single edit. Entries hold what a change replaced by reference rather
+    than copying the data: the projects a delete removed, the list a reset
+    swapped out, shallow before/after copies of an edited project. The
+    stack grows with the edits made, not with the size of the data, and
+    undoing a reset just puts the old list back.
+    """
+
+    def __init__(self, app, limit=UNDO_LIMIT):
+        self.app = app
+        self.undo_steps = deque(maxlen=limit)
+        self.redo_steps = []
+        self.group = None
+        self.depth = 0
+        self.replaying = False
+        self.on_state = None  # Called with (can_undo, can_redo) after each step
+
+    def begin(self):
+        """Start collecting changes into one step; calls nest."""
+        if self.depth == 0:
+            self.group = []
+        self.depth += 1
+
+    def end(self):
+        self.depth -= 1
+        if self.depth == 0:
+            group, self.group = self.group, None
+            if group:
+                self._push(group)
+
+    def capture(self, op, target, before, payload):
+        """Remember how to undo one recorded change."""
+        if self.replaying:
+            return
+        if before is None and op in ("update", "delete_many", "reset", "settings"):
+            # Recorded without what it replaced; nothing to go back to
+            return
+        if op == "add":
+            entry = ("add", target)
+        elif op == "update":
+            entry = ("update", payload["id"], before, dict(target))
+        elif op == "delete":
+            entry = ("delete", target)
+        elif op == "delete_many":
+            entry = ("delete_many", before)
+        elif op == "reset":
+            entry = ("reset", before)
+        elif op == "settings":
+            entry = ("settings", before, dict(payload["settings"]))
+        else:
+            return
+        self._add(entry)
+
+    def capture_ledger(self, entry):
+        """Remember a completion CompletionLedger.record() logged; the ledger is not journaled."""
+        if not self.replaying:
+            self._add(("ledger", entry))
+
+    def _add(self, entry):
+        if self.group is not None:
+            self.group.append(entry)
+        else:
+            self._push([entry])
+
+    def _push(self, step):
+        self.undo_steps.append(step)
+        self.redo_steps.clear()
+        self._changed()
+
+    def _changed(self):
+        if self.on_state:
+            self.on_state(bool(self.undo_steps), bool(self.redo_steps))
+
+    def clear(self):
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+        self._changed()
+
+    def undo(self):
+        """Revert the last step; returns the ops it touched."""
+        if not self.undo_steps:
+            return set()
+        step = self.undo_steps.pop()
+        ops = self._replay(reversed(step), undo=True)
+        self.redo_steps.append(step)
+        self._changed()
+        return ops
+
+    def redo(self):
+        if not self.redo_steps:
+            return set()
+        step = self.redo_steps.pop()
+        ops = self._replay(step, undo=False)
+        self.undo_steps.append(step)
+        self._changed()
+        return ops
+
+    @contextmanager
+    def replay(self):
+        """Leave changes made inside the block off the stack, e.g. screens refreshing after an undo."""
+        replaying, self.replaying = self.replaying, True
+        try:
+            yield
+        finally:
+            self.replaying = replaying
+
+    def _replay(self, entries, undo):
+        app = self.app
+        ops = set()
+        with self.replay():
+            # Journaled as one batch, like the action being undone
+            with app.transaction():
+                for entry in entries:
+                    ops.add(entry[0])
+                    try:
+                        self._apply(entry, undo)
+                    except Exception as e:
+                        print(f"Error {'undoing' if undo else 'redoing'} {entry[0]}: {e}")
+        return ops
+
+    def _apply(self, entry, undo):
+        app = self.app
+        op = entry[0]
+        if op == "add":
+            project = entry[1]
+            if undo:
+                app.delete_project(project["id"])
+            elif app.get_project(project["id"]) is None:
+                app.add_project(project)
+        elif op == "update":
+            _, project_id, before, after = entry
+            project = app.get_project(project_id)
+            if project is None:
+                # Deleted since, here or by another writer
+                return
+            old_data = project.copy()
+            # Replaced whole so keys such as completed_on come and go with it
+            project.clear()
+            project.update(before if undo else after)
+            app.history_store.record(project, old_data, project)
+            app.record_change("update", target=project, id=project_id, fields=project.copy(), replace=True)
+        elif op == "delete":
+            project = entry[1]
+            if not undo:
+                app.delete_project(project["id"])
+            elif app.get_project(project["id"]) is None:
+                app.add_project(project)
+        elif op == "delete_many":
+            projects = entry[1]
+            if not undo:
+                app.delete_projects([p["id"] for p in projects])
+            else:
+                for project in projects:
+                    if app.get_project(project["id"]) is None:
+                        app.add_project(project)
+        elif op == "reset":
+            if undo:
+                app.restore_projects(entry[1])
+            else:
+                app.reset_projects()
+        elif op == "settings":
+            _, before, after = entry
+            app.app_data["settings"] = dict(before if undo else after)
+            app.record_change("settings", settings=app.app_data["settings"])
+        elif op == "ledger":
+            ledger_entry = entry[1]
+            if undo:
+                app.ledger.unrecord(ledger_entry)
+            else:
+                app.ledger.record(ledger_entry["series"], ledger_entry["name"], ledger_entry["recurrence"],
+                                  date.fromisoformat(ledger_entry["date"]))